@@ -0,0 +1,278 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+import streamlit as st
+from collections import Counter
+from ai_retrieval import STOPWORDS, is_number, tokenize
+
+# Caché de respuestas de la IA en disco, compartida por todas las sesiones y usuarios
+AI_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ai_responses.sqlite3")
+AI_CACHE_TTL_SECONDS = 12 * 60 * 60  # Las respuestas caducan a las 12 horas
+AI_CACHE_MAX_ENTRIES = 5000  # Por encima se expulsan las menos usadas (LRU)
+
+# Caché semántica de preguntas: similitud mínima (coseno entre términos) para reutilizar una respuesta
+AI_SEMANTIC_THRESHOLD = 0.85
+# Preguntas candidatas que se comparan por cada estado de datos
+AI_SEMANTIC_MAX_CANDIDATES = 200
+# Palabras que cambian el sentido de una pregunta: la búsqueda (BM25) las descarta, pero la
+# caché semántica las conserva y solo reutiliza respuestas si coinciden exactamente
+QUESTION_MARKERS = {
+    'no', 'sin', 'nunca', 'cuando', 'como', 'donde', 'cual', 'cuanto', 'cuantos', 'por', 'que', 'porque',
+    'debo', 'puedo',
+}
+QUESTION_STOPWORDS = STOPWORDS - QUESTION_MARKERS
+_QUESTION_MARKER_TERMS = set(tokenize(" ".join(QUESTION_MARKERS), stopwords=()))
+
+
+class AIResponseCache:
+    """Caché persistente (SQLite) de respuestas de la IA con caducidad y expulsión LRU"""
+
+    def __init__(self, path=AI_CACHE_PATH, ttl=AI_CACHE_TTL_SECONDS, max_entries=AI_CACHE_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                created_at REAL,
+                last_access REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+
+    @staticmethod
+    def make_key(model_name, prompt):
+        """Clave por contenido: hash del modelo y del prompt completo"""
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Devuelve la respuesta guardada o None si no existe o ha caducado"""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key, model_name, response):
+        """Guarda una respuesta y expulsa las entradas caducadas o menos usadas"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model_name, response, now, now)
+            )
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            self.conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+
+def normalize_question(pregunta):
+    """Pregunta normalizada (minúsculas, sin tildes, signos ni palabras vacías, raíces), con negaciones e interrogativos"""
+    return " ".join(tokenize(pregunta, stopwords=QUESTION_STOPWORDS))
+
+def _markers(terms):
+    """Negaciones e interrogativos de una pregunta normalizada"""
+    return {term for term in terms if term in _QUESTION_MARKER_TERMS}
+
+def _numbers(terms):
+    """Valores numéricos de una pregunta normalizada (mediciones, dosis...)"""
+    return {term for term in terms if is_number(term)}
+
+def _cosine(a, b):
+    """Similitud coseno entre dos bolsas de términos"""
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[term] for term, count in a.items() if term in b)
+    return dot / (math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values())))
+
+
+class SemanticAnswerCache:
+    """
+    Respuestas a preguntas personalizadas reutilizables dentro del archivo de cada usuario.
+
+    Una respuesta se reutiliza si el estado de los datos (estado de cada parámetro) coincide,
+    la pregunta tiene las mismas negaciones, interrogativos y números y el resto se parece lo
+    suficiente (similitud >= threshold). fingerprint incluye el archivo del usuario: el prompt
+    lleva su historial, así que una respuesta no se sirve nunca a otro usuario.
+    """
+
+    def __init__(self, path=AI_CACHE_PATH, ttl=AI_CACHE_TTL_SECONDS, max_entries=AI_CACHE_MAX_ENTRIES,
+                 threshold=AI_SEMANTIC_THRESHOLD):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS question_answers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                model TEXT,
+                fingerprint TEXT,
+                question TEXT,
+                response TEXT,
+                created_at REAL,
+                last_access REAL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_question_answers_state ON question_answers (model, fingerprint, last_access)"
+        )
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def lookup(self, model_name, fingerprint, pregunta):
+        """Devuelve (respuesta, similitud) de la pregunta más parecida o (None, mejor similitud)"""
+        terms = Counter(normalize_question(pregunta).split())
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(
+                """
+                SELECT id, question, response FROM question_answers
+                WHERE model = ? AND fingerprint = ? AND created_at >= ?
+                ORDER BY last_access DESC LIMIT ?
+                """,
+                (model_name, fingerprint, now - self.ttl, AI_SEMANTIC_MAX_CANDIDATES)
+            ).fetchall()
+
+            best_id, best_response, best_score = None, None, 0.0
+            for row_id, question, response in rows:
+                candidate = Counter(question.split())
+                # Otro sentido u otros valores (pH 7.2 frente a 7.8): no se reutiliza
+                if _markers(candidate) != _markers(terms) or _numbers(candidate) != _numbers(terms):
+                    continue
+                score = _cosine(terms, candidate)
+                if score > best_score:
+                    best_id, best_response, best_score = row_id, response, score
+
+            if best_id is not None and best_score >= self.threshold:
+                self.hits += 1
+                self.conn.execute("UPDATE question_answers SET last_access = ? WHERE id = ?", (now, best_id))
+                return best_response, best_score
+            self.misses += 1
+            return None, best_score
+
+    def store(self, model_name, fingerprint, pregunta, response):
+        """Guarda la respuesta y expulsa las caducadas o menos usadas"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO question_answers (model, fingerprint, question, response, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (model_name, fingerprint, normalize_question(pregunta), response, now, now)
+            )
+            self.conn.execute("DELETE FROM question_answers WHERE created_at < ?", (now - self.ttl,))
+            self.conn.execute("""
+                DELETE FROM question_answers WHERE id IN (
+                    SELECT id FROM question_answers ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+
+@st.cache_resource
+def get_ai_cache():
+    """Instancia única de la caché de respuestas para todo el proceso"""
+    return AIResponseCache()
+
+@st.cache_resource
+def get_semantic_cache():
+    """Instancia única de la caché semántica de preguntas para todo el proceso"""
+    return SemanticAnswerCache()
+
+def _cache_or_none():
+    """Caché de respuestas, o None si no hay disco disponible"""
+    try:
+        return get_ai_cache()
+    except Exception:
+        return None
+
+def stream_with_cache(model, model_name, prompt, metrics=None):
+    """
+    Genera la respuesta por fragmentos (streaming) y la guarda en caché al terminar.
+
+    Si se pasa un dict en metrics se rellenan 'cached', 'ttft' (segundos hasta el
+    primer fragmento) y 'total' (segundos hasta el último).
+    """
+    metrics = metrics if metrics is not None else {}
+    start = time.perf_counter()
+    cache = _cache_or_none()
+    key = cache.make_key(model_name, prompt) if cache else None
+
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        metrics.update(cached=True, ttft=time.perf_counter() - start, total=time.perf_counter() - start)
+        yield cached
+        return
+
+    metrics['cached'] = False
+    partes = []
+    for chunk in model.generate_content(prompt, stream=True):
+        try:
+            texto = chunk.text
+        except ValueError:
+            # Fragmento sin texto (p. ej. solo metadatos de seguridad)
+            continue
+        if not partes:
+            metrics['ttft'] = time.perf_counter() - start
+        partes.append(texto)
+        yield texto
+
+    metrics['total'] = time.perf_counter() - start
+    if cache and partes:
+        cache.set(key, model_name, "".join(partes))
+
+def stream_with_semantic_cache(model, model_name, prompt, pregunta, scope, fingerprint, metrics=None):
+    """
+    Como stream_with_cache, pero antes busca una respuesta a una pregunta parecida con el
+    mismo estado de datos en el mismo archivo (scope: spreadsheet_id del usuario).
+    Rellena además 'semantic' (similitud) y 'hit_rate' en metrics.
+    """
+    metrics = metrics if metrics is not None else {}
+    fingerprint = f"{scope}#{fingerprint}"
+    start = time.perf_counter()
+    try:
+        semantic = get_semantic_cache()
+    except Exception:
+        semantic = None
+
+    if semantic is not None:
+        cached, score = semantic.lookup(model_name, fingerprint, pregunta)
+        metrics['hit_rate'] = semantic.hit_rate
+        if cached is not None:
+            metrics.update(cached=True, semantic=score, ttft=time.perf_counter() - start, total=time.perf_counter() - start)
+            yield cached
+            return
+
+    partes = []
+    for texto in stream_with_cache(model, model_name, prompt, metrics):
+        partes.append(texto)
+        yield texto
+
+    if semantic is not None and partes:
+        semantic.store(model_name, fingerprint, pregunta, "".join(partes))
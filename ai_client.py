@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+import streamlit as st
+from fake_llm import FakeLLM
+
+# Modelo de Gemini (también forma parte de la clave de la caché de respuestas)
+GEMINI_MODEL = 'gemini-1.5-flash'
+
+# Plazo máximo de una llamada completa a Gemini (segundos)
+AI_CALL_TIMEOUT_SECONDS = 30
+# Llamadas simultáneas a Gemini por proceso y espera máxima por un hueco libre
+AI_MAX_CONCURRENT_CALLS = 4
+AI_SLOT_WAIT_SECONDS = 5
+# Cortacircuitos: fallos seguidos para abrirlo y segundos hasta volver a probar
+AI_BREAKER_FAILURES = 3
+AI_BREAKER_COOLDOWN_SECONDS = 60
+
+
+class AIUnavailableError(Exception):
+    """La IA no puede responder ahora (cortacircuitos abierto, plazo agotado o saturada)"""
+
+
+class CircuitBreaker:
+    """Cortacircuitos: tras varios fallos seguidos deja de llamar a la IA durante un tiempo"""
+
+    def __init__(self, max_failures=AI_BREAKER_FAILURES, cooldown=AI_BREAKER_COOLDOWN_SECONDS):
+        self.lock = threading.Lock()
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "cerrado"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "semiabierto"
+        return "abierto"
+
+    def allow(self):
+        """Indica si se puede llamar; en semiabierto solo deja pasar una llamada de prueba"""
+        with self.lock:
+            state = self.state
+            if state == "cerrado":
+                return True
+            if state == "semiabierto" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.failures >= self.max_failures or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class LLMClient:
+    """
+    Modelo de IA compartido por el proceso con plazo por llamada, límite de
+    concurrencia y cortacircuitos.
+
+    Expone generate_content como el modelo original, así que se puede pasar
+    directamente a stream_with_cache / stream_with_semantic_cache; model_name
+    forma parte de la clave de esas cachés.
+    """
+
+    def __init__(self, model, model_name, timeout=AI_CALL_TIMEOUT_SECONDS, max_concurrent=AI_MAX_CONCURRENT_CALLS):
+        self.model = model
+        self.model_name = model_name
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.breaker = CircuitBreaker()
+
+    def _acquire(self):
+        """Reserva un hueco de concurrencia si el cortacircuitos lo permite"""
+        if not self.slots.acquire(timeout=AI_SLOT_WAIT_SECONDS):
+            raise AIUnavailableError("demasiadas consultas simultáneas a la IA")
+        if not self.breaker.allow():
+            self.slots.release()
+            raise AIUnavailableError("la IA ha fallado varias veces seguidas; se reintentará en unos segundos")
+
+    def generate_content(self, prompt, stream=False):
+        if stream:
+            return self._stream(prompt)
+        self._acquire()
+        try:
+            response = self.model.generate_content(prompt, request_options={"timeout": self.timeout})
+        except Exception as e:
+            self.breaker.record_failure()
+            raise AIUnavailableError(f"sin respuesta de la IA: {e}") from e
+        finally:
+            self.slots.release()
+        self.breaker.record_success()
+        return response
+
+    def _stream(self, prompt):
+        """Fragmentos de la respuesta, cortando si se supera el plazo total"""
+        self._acquire()
+        deadline = time.monotonic() + self.timeout
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True, request_options={"timeout": self.timeout}):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"plazo de {self.timeout}s agotado")
+                yield chunk
+        except Exception as e:
+            self.breaker.record_failure()
+            raise AIUnavailableError(f"sin respuesta de la IA: {e}") from e
+        else:
+            self.breaker.record_success()
+        finally:
+            self.slots.release()
+
+
+def _gemini_model(settings):
+    """Modelo real de Google Gemini (requiere GEMINI_API_KEY y conexión)"""
+    import google.generativeai as genai
+    genai.configure(api_key=settings['api_key'])
+    return genai.GenerativeModel(GEMINI_MODEL)
+
+def _fake_model(settings):
+    """Modelo local simulado (sin conexión), configurable con [fake_llm] en secrets.toml"""
+    return FakeLLM(**settings)
+
+# Proveedores disponibles: nombre -> (nombre del modelo, fábrica(settings) -> objeto con generate_content)
+LLM_PROVIDERS = {
+    'gemini': (GEMINI_MODEL, _gemini_model),
+    'fake': ('fake-llm', _fake_model),
+}
+
+def register_llm_provider(name, model_name, factory):
+    """Añade un proveedor; factory(settings) debe devolver un objeto con generate_content(prompt, stream, request_options)"""
+    LLM_PROVIDERS[name] = (model_name, factory)
+
+def _secret(key, default=None):
+    """Valor de st.secrets, o default si no existe (o no hay secrets.toml)"""
+    try:
+        return st.secrets.get(key, default)
+    except Exception:
+        return default
+
+@st.cache_resource
+def _get_llm_client(provider, settings_items):
+    """Un cliente por proveedor y configuración para todo el proceso (se configura una sola vez)"""
+    model_name, factory = LLM_PROVIDERS[provider]
+    return LLMClient(factory(dict(settings_items)), model_name)
+
+def get_llm_client(provider=None, **settings):
+    """
+    Cliente de IA del proveedor indicado, o del configurado en la variable de entorno
+    AI_PROVIDER o en st.secrets["AI_PROVIDER"] ('gemini' por defecto).
+    """
+    provider = provider or os.environ.get("AI_PROVIDER") or _secret("AI_PROVIDER", "gemini")
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"Proveedor de IA desconocido: {provider}")
+
+    if provider == 'gemini':
+        settings.setdefault('api_key', st.secrets["GEMINI_API_KEY"])
+    elif provider == 'fake':
+        settings = {**dict(_secret("fake_llm", {})), **settings}
+    return _get_llm_client(provider, tuple(sorted(settings.items())))
+
+def stream_with_fallback(fragments, fallback, metrics=None):
+    """
+    Devuelve los fragmentos de la IA; si la IA no está disponible (cortacircuitos abierto,
+    plazo agotado o saturada) sigue con el análisis determinista de fallback().
+    """
+    metrics = metrics if metrics is not None else {}
+    start = time.perf_counter()
+    recibido = False
+    try:
+        for fragmento in fragments:
+            recibido = True
+            yield fragmento
+    except AIUnavailableError as e:
+        metrics['fallback'] = True
+        metrics.setdefault('ttft', time.perf_counter() - start)
+        metrics['total'] = time.perf_counter() - start
+        aviso = f"⚠️ IA no disponible ({e}). Análisis automático basado en reglas:\n\n"
+        yield ("\n\n" if recibido else "") + aviso + fallback()
@@ -0,0 +1,378 @@
+import logging
+import math
+import pandas as pd
+import streamlit as st
+from pool_analysis import RANGES, check_parameter_status
+from sheets_data import get_data_version
+
+logger = logging.getLogger(__name__)
+
+# Parámetros que se resumen en el contexto de la IA
+PARAMETROS_IA = ['pH', 'Sal', 'FAC', 'ORP', 'Conductividad', 'TDS', 'Temperatura']
+
+# Mediciones y mantenimientos recientes que se incluyen en el prompt
+ULTIMAS_MEDICIONES = 10
+ULTIMOS_MANTENIMIENTOS = 5
+
+# Presupuesto de tokens para el contexto del prompt (sin contar las instrucciones fijas)
+AI_CONTEXT_TOKEN_BUDGET = 1200
+# Reparto del presupuesto entre secciones ('relevantes': registros del historial recuperados
+# para una pregunta, solo en el prompt de preguntas)
+AI_SECTION_BUDGET_SHARES = {
+    'tendencias': 0.10,
+    'estadisticas': 0.16,
+    'mediciones': 0.19,
+    'notas': 0.15,
+    'mantenimiento': 0.15,
+    'piscina': 0.10,
+    'relevantes': 0.15,
+}
+# Estimación de caracteres por token (texto en español con números)
+CHARS_PER_TOKEN = 4
+
+# Ventana reciente de la tabla de estadísticas (días)
+ESTADISTICAS_DIAS = 30
+# Notas candidatas (últimas mediciones con nota) y longitud máxima de cada una
+NOTAS_CANDIDATAS = 50
+NOTA_MAX_CHARS = 160
+# Palabras que hacen más relevante una nota para la IA
+NOTAS_PALABRAS_CLAVE = [
+    'ph', 'sal', 'cloro', 'fac', 'orp', 'clorador', 'célula', 'celula', 'filtro', 'arena',
+    'bomba', 'turbia', 'verde', 'algas', 'lluvia', 'tormenta', 'baño', 'bañistas', 'ácido',
+    'acido', 'choque', 'contralavado', 'vaciado', 'relleno', 'calor',
+]
+
+
+def estimate_tokens(texto):
+    """Estimación rápida de tokens de un texto (sin llamar a la API)"""
+    return math.ceil(len(texto) / CHARS_PER_TOKEN)
+
+def log_prompt_size(tipo, prompt, metrics=None):
+    """Registra el tamaño del prompt y lo añade a metrics ('prompt_tokens')"""
+    tokens = estimate_tokens(prompt)
+    logger.info("Prompt IA '%s': %d caracteres, ~%d tokens", tipo, len(prompt), tokens)
+    if metrics is not None:
+        metrics['prompt_tokens'] = tokens
+    return tokens
+
+def truncate_text(texto, max_chars=NOTA_MAX_CHARS):
+    """Recorta un texto libre a max_chars caracteres"""
+    texto = " ".join(str(texto).split())
+    return texto if len(texto) <= max_chars else texto[:max_chars - 1].rstrip() + "…"
+
+def _fit_lines(texto, max_tokens, keep_last=False):
+    """Descarta líneas hasta que el texto quepa en max_tokens (las primeras si keep_last)"""
+    lines = texto.split("\n")
+    if estimate_tokens(texto) <= max_tokens:
+        return texto
+
+    kept = []
+    used = 0
+    for line in (reversed(lines) if keep_last else lines):
+        cost = estimate_tokens(line + "\n")
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    if keep_last:
+        kept.reverse()
+    return "\n".join(kept) if kept else truncate_text(lines[-1 if keep_last else 0], max_tokens * CHARS_PER_TOKEN)
+
+def _trends_section(df):
+    """Valor actual, estado y tendencia de cada parámetro"""
+    stats_resumen = []
+    for param in PARAMETROS_IA:
+        if param in df.columns:
+            current = df[param].iloc[-1]
+            avg_last_5 = df[param].tail(5).mean()
+            trend = "📈 subiendo" if current > avg_last_5 else "📉 bajando" if current < avg_last_5 else "➡️ estable"
+
+            # Agregar estado actual
+            status = check_parameter_status(current, param)
+            estado_texto = {"optimal": "✅ ÓPTIMO", "low": "⚠️ BAJO", "high": "⚠️ ALTO", "unknown": "❓"}.get(status, "❓")
+
+            unit = RANGES.get(param, {}).get('unit', '')
+            valor = f"{current} {unit}" if unit else f"{current}"
+            stats_resumen.append(f"• {param}: {valor} (promedio últimas 5: {avg_last_5:.1f}) - {estado_texto} - {trend}")
+    return "\n".join(stats_resumen)
+
+def _measurements_section(df):
+    """Últimas mediciones (sus notas van solo en la sección de notas)"""
+    datos_con_contexto = []
+    for _, row in df.tail(ULTIMAS_MEDICIONES).iterrows():
+        fecha_str = row['Dia'].strftime('%d/%m/%Y')
+        datos_con_contexto.append(f"{fecha_str}: pH={row['pH']}, Sal={row['Sal']}, FAC={row['FAC']}, ORP={row['ORP']}")
+    return "\n".join(datos_con_contexto)
+
+def _stats_section(df):
+    """Tabla compacta por parámetro: reciente (últimos ESTADISTICAS_DIAS días) e histórico completo"""
+    lines = [f"Parámetro | Actual | Media {ESTADISTICAS_DIAS}d | Mín-Máx {ESTADISTICAS_DIAS}d | Media total | % en rango | N"]
+    recientes = df[df['Dia'] >= df['Dia'].max() - pd.Timedelta(days=ESTADISTICAS_DIAS)] if 'Dia' in df.columns else df
+
+    for param in PARAMETROS_IA:
+        if param not in df.columns:
+            continue
+        serie = pd.to_numeric(df[param], errors='coerce').dropna()
+        if serie.empty:
+            continue
+        reciente = pd.to_numeric(recientes[param], errors='coerce').dropna()
+        if reciente.empty:
+            reciente = serie.tail(1)
+
+        rango = RANGES.get(param, {})
+        en_rango = serie.between(rango.get('min', -math.inf), rango.get('max', math.inf)).mean() * 100
+        lines.append(
+            f"{param} | {serie.iloc[-1]:g} | {reciente.mean():.2f} | {reciente.min():g}-{reciente.max():g} | "
+            f"{serie.mean():.2f} | {en_rango:.0f}% | {len(serie)}"
+        )
+    return "\n".join(lines) if len(lines) > 1 else "No hay mediciones suficientes"
+
+def _note_score(row, hoy):
+    """Relevancia de una nota: más reciente, con palabras clave o en un día con parámetros fuera de rango"""
+    texto = str(row['Notas']).lower()
+    dias = max((hoy - row['Dia']).days, 0)
+    score = 1.0 / (1.0 + dias / 30.0)
+    score += 0.5 * sum(1 for palabra in NOTAS_PALABRAS_CLAVE if palabra in texto)
+    score += sum(
+        1.0 for param in PARAMETROS_IA
+        if param in row and pd.notna(row[param]) and check_parameter_status(row[param], param) in ('low', 'high')
+    )
+    return score
+
+def note_line(fecha, nota):
+    """Línea de una nota en la sección de notas (también identifica la nota en la búsqueda del historial)"""
+    return f"• {fecha.strftime('%d/%m/%Y')}: {truncate_text(nota)}"
+
+def _notes_section(df, max_tokens=None):
+    """Notas del propietario más relevantes, recortadas y en orden cronológico"""
+    vacio = "No hay notas registradas en las últimas mediciones"
+    if 'Notas' not in df.columns:
+        return vacio
+
+    con_nota = df[df['Notas'].notna() & (df['Notas'].astype(str).str.strip() != "")].tail(NOTAS_CANDIDATAS)
+    if con_nota.empty:
+        return vacio
+
+    # Se eligen por relevancia hasta agotar el presupuesto y se muestran por fecha
+    hoy = pd.Timestamp.now().normalize()
+    ranked = sorted(con_nota.iterrows(), key=lambda item: _note_score(item[1], hoy), reverse=True)
+    elegidas = []
+    used = 0
+    for idx, row in ranked:
+        linea = note_line(row['Dia'], row['Notas'])
+        cost = estimate_tokens(linea + "\n")
+        if max_tokens is not None and used + cost > max_tokens:
+            continue
+        elegidas.append((row['Dia'], linea))
+        used += cost
+
+    if not elegidas:
+        return vacio
+    return "\n".join(linea for _, linea in sorted(elegidas, key=lambda item: item[0]))
+
+def _maintenance_section(maint_df):
+    """Mantenimientos recientes y próximos programados"""
+    if maint_df is None or maint_df.empty:
+        return "No hay datos de mantenimiento disponibles"
+
+    try:
+        maint_lines = []
+        for _, maint in maint_df.tail(ULTIMOS_MANTENIMIENTOS).iterrows():
+            fecha_mant = maint['Fecha'].strftime('%d/%m/%Y')
+            maint_lines.append(f"• {fecha_mant}: {maint['Tipo']} (Estado antes: {maint['Estado_Antes']}, {maint['Tiempo_Minutos']}min)")
+            if pd.notna(maint['Notas']) and str(maint['Notas']).strip():
+                maint_lines.append(f"  └─ Notas: {truncate_text(maint['Notas'])}")
+
+        # Próximos mantenimientos
+        future_maint = maint_df[
+            (maint_df['Proximo_Mantenimiento'].notna()) &
+            (maint_df['Proximo_Mantenimiento'] > pd.Timestamp.now())
+        ]
+
+        if not future_maint.empty:
+            maint_lines.append("\nPRÓXIMOS MANTENIMIENTOS:")
+            for _, future in future_maint.head(3).iterrows():
+                days_until = (future['Proximo_Mantenimiento'].date() - pd.Timestamp.now().date()).days
+                maint_lines.append(f"• {future['Tipo']}: {future['Proximo_Mantenimiento'].strftime('%d/%m/%Y')} (en {days_until} días)")
+
+        return "\n".join(maint_lines)
+    except Exception as e:
+        return f"Error obteniendo mantenimiento: {str(e)}"
+
+def _pool_section(pool_info):
+    """Información técnica y equipamiento de la piscina"""
+    if not pool_info:
+        return "No hay información de piscina disponible"
+
+    try:
+        info_lines = []
+
+        volumen = pool_info.get('Volumen_Litros', {}).get('valor', '0')
+        if volumen != '0':
+            info_lines.append(f"• Volumen: {volumen} litros")
+
+        largo = pool_info.get('Largo_Metros', {}).get('valor', '')
+        ancho = pool_info.get('Ancho_Metros', {}).get('valor', '')
+        prof = pool_info.get('Profundidad_Metros', {}).get('valor', '')
+        if largo and ancho and prof:
+            info_lines.append(f"• Dimensiones: {largo}m x {ancho}m x {prof}m")
+
+        # Equipamiento y datos generales
+        campos = [
+            ('Bomba_Modelo', "Bomba"),
+            ('Filtro_Tipo', "Filtro"),
+            ('Clorador_Modelo', "Clorador"),
+            ('Generador_Porcentaje', "Generador configurado al"),
+            ('Ubicacion', "Ubicación"),
+            ('Fecha_Instalacion', "Instalación"),
+            ('Notas_Generales', "Notas importantes"),
+        ]
+        for campo, etiqueta in campos:
+            valor = pool_info.get(campo, {}).get('valor', '')
+            if valor:
+                sufijo = "%" if campo == 'Generador_Porcentaje' else ""
+                info_lines.append(f"• {etiqueta}: {valor}{sufijo}")
+
+        return "\n".join(info_lines) if info_lines else "Información de piscina incompleta"
+    except Exception as e:
+        return f"Error obteniendo info piscina: {str(e)}"
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _render_sections(data_version, today, token_budget, _df, _maint_df, _pool_info):
+    """Renderiza y compacta las secciones de contexto (memoizado por versión de datos, día y presupuesto)"""
+    presupuesto = {seccion: int(token_budget * share) for seccion, share in AI_SECTION_BUDGET_SHARES.items()}
+    secciones = {
+        'tendencias': _fit_lines(_trends_section(_df), presupuesto['tendencias']),
+        'estadisticas': _fit_lines(_stats_section(_df), presupuesto['estadisticas']),
+        'mediciones': _fit_lines(_measurements_section(_df), presupuesto['mediciones'], keep_last=True),
+        'notas': _notes_section(_df, presupuesto['notas']),
+        'mantenimiento': _fit_lines(_maintenance_section(_maint_df), presupuesto['mantenimiento'], keep_last=True),
+        'piscina': _fit_lines(_pool_section(_pool_info), presupuesto['piscina']),
+    }
+    logger.info(
+        "Contexto IA: ~%d tokens (presupuesto %d)",
+        sum(estimate_tokens(texto) for texto in secciones.values()), token_budget
+    )
+    return secciones
+
+def ai_data_version(df, maint_df, pool_info):
+    """Versión de los datos que alimentan el contexto (mediciones, mantenimiento e info de piscina)"""
+    return (get_data_version(df), get_data_version(maint_df), repr(sorted(pool_info.items())))
+
+def build_ai_context(df, maint_df, pool_info, data_version, token_budget=AI_CONTEXT_TOKEN_BUDGET):
+    """
+    Construye el contexto de la IA a partir de los datos ya cargados.
+
+    data_version identifica el estado de mediciones, mantenimiento e info de piscina;
+    mientras no cambie (y no cambie el día) se reutilizan las secciones ya renderizadas.
+    Cada sección se recorta a su parte de token_budget.
+    """
+    return _render_sections(data_version, pd.Timestamp.now().date().isoformat(), token_budget, df, maint_df, pool_info)
+
+def add_relevant_records(contexto, relevantes, token_budget=AI_CONTEXT_TOKEN_BUDGET):
+    """Contexto con los registros recuperados para una pregunta, recortados a su parte de token_budget"""
+    contexto = dict(contexto)
+    contexto['relevantes'] = _fit_lines(relevantes, int(token_budget * AI_SECTION_BUDGET_SHARES['relevantes']))
+    logger.info(
+        "Contexto IA con registros relacionados: ~%d tokens (relevantes ~%d, presupuesto %d)",
+        sum(estimate_tokens(contexto[seccion]) for seccion in AI_SECTION_BUDGET_SHARES),
+        estimate_tokens(contexto['relevantes']), token_budget
+    )
+    return contexto
+
+def build_analysis_prompt(contexto):
+    """Prompt del análisis automático de tendencias"""
+    # ============================================================================
+    # 🤖 PROMPT COMPLETO PARA IA
+    # ============================================================================
+    prompt = f"""
+Eres un experto en mantenimiento de piscinas con clorador salino. Tienes acceso completo al historial:
+
+DATOS RECIENTES DE MEDICIONES:
+{contexto['mediciones']}
+
+TENDENCIAS DETECTADAS:
+{contexto['tendencias']}
+
+ESTADÍSTICAS DEL HISTORIAL:
+{contexto['estadisticas']}
+
+HISTORIAL DE MANTENIMIENTO:
+{contexto['mantenimiento']}
+
+INFORMACIÓN TÉCNICA DE LA PISCINA:
+{contexto['piscina']}
+
+NOTAS DEL PROPIETARIO (MÁS RELEVANTES):
+{contexto['notas']}
+
+RANGOS ÓPTIMOS:
+• pH: 7.2-7.6 | Sal: 2700-4500 ppm | FAC: 1.0-3.0 ppm
+• ORP: 650-750 mV | Conductividad: 4000-8000 µS/cm | TDS: 2000-4500 ppm
+
+CONTEXTO IMPORTANTE:
+- Considera el historial de mantenimiento para entender cambios
+- Ten en cuenta el equipamiento y configuración actual
+- Relaciona problemas con mantenimientos pendientes o recientes
+- Sugiere acciones basadas en el volumen y características de la piscina
+
+Proporciona análisis experto (máximo 300 palabras) con:
+
+🎯 **ESTADO ACTUAL** (considerando todo el contexto)
+📊 **ANÁLISIS DE TENDENCIAS** (relacionando con mantenimiento e info técnica)
+⚠️ **ALERTAS CRÍTICAS** (parámetros + mantenimiento vencido)
+💡 **RECOMENDACIONES ESPECÍFICAS** (4 acciones prioritarias basadas en todo el contexto)
+
+Respuesta profesional y específica para esta piscina en particular.
+    """
+    return prompt
+
+def build_question_prompt(contexto, pregunta_usuario):
+    """Prompt para responder una pregunta concreta del usuario"""
+    # ============================================================================
+    # 🤖 PROMPT ENFOCADO EN LA PREGUNTA CON CONTEXTO COMPLETO
+    # ============================================================================
+    prompt = f"""
+Eres un experto técnico en piscinas con clorador salino. Un propietario te hace esta pregunta específica:
+
+PREGUNTA: "{pregunta_usuario}"
+
+DATOS ACTUALES Y TENDENCIAS:
+{contexto['tendencias']}
+
+ESTADÍSTICAS DEL HISTORIAL:
+{contexto['estadisticas']}
+
+ÚLTIMAS MEDICIONES CON CONTEXTO:
+{contexto['mediciones']}
+
+HISTORIAL DE MANTENIMIENTO COMPLETO:
+{contexto['mantenimiento']}
+
+INFORMACIÓN TÉCNICA COMPLETA DE LA PISCINA:
+{contexto['piscina']}
+
+NOTAS DEL PROPIETARIO (MÁS RELEVANTES):
+{contexto['notas']}
+
+OTROS REGISTROS DEL HISTORIAL RELACIONADOS CON LA PREGUNTA:
+{contexto.get('relevantes', 'No disponibles')}
+
+RANGOS ÓPTIMOS DE REFERENCIA:
+• pH: 7.2-7.6 | Sal: 2700-4500 ppm | FAC: 1.0-3.0 ppm | ORP: 650-750 mV
+• Conductividad: 4000-8000 µS/cm | TDS: 2000-4500 ppm | Temperatura: 22-32°C
+
+INSTRUCCIONES:
+- Responde ESPECÍFICAMENTE a su pregunta usando TODO el contexto disponible
+- Relaciona la pregunta con los datos históricos, mantenimiento y características técnicas
+- Si pregunta sobre parámetros, menciona valores actuales y tendencias
+- Si pregunta sobre mantenimiento, considera el historial completo
+- Si pregunta sobre dosificación, calcula según volumen y equipamiento específico
+- Si pregunta sobre timing, considera historial de mantenimiento y próximas tareas
+- Usa las notas del propietario para entender contexto de cambios
+- Para preguntas sobre cuándo ocurrió algo, apóyate en los registros del historial relacionados con la pregunta
+- Respuesta máximo 250 palabras, experta y específica para ESTA piscina
+
+Responde como un técnico experto que conoce perfectamente esta piscina específica, su historial y equipamiento.
+    """
+    return prompt
@@ -0,0 +1,109 @@
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+
+# Análisis de IA simultáneos por proceso (llamadas a Gemini en paralelo)
+AI_MAX_CONCURRENT_JOBS = 4
+# Análisis en espera por usuario (cada usuario ejecuta uno a la vez)
+AI_MAX_QUEUED_PER_USER = 2
+# Tiempo que se conservan los resultados terminados (segundos)
+AI_JOB_RESULT_TTL = 60 * 60
+
+
+class AIJob:
+    """Análisis de IA en segundo plano; el texto se va completando mientras llegan fragmentos"""
+
+    def __init__(self, user, fragments, metrics=None, **info):
+        self.id = uuid.uuid4().hex
+        self.user = user
+        self.fragments = fragments
+        self.info = info
+        self.status = "pendiente"  # pendiente -> en_curso -> completado / error
+        self.text = ""
+        self.error = None
+        self.metrics = metrics if metrics is not None else {}
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.status in ("completado", "error")
+
+
+class AIJobRunner:
+    """Pool de hilos acotado que ejecuta análisis de IA con una cola por usuario"""
+
+    def __init__(self, max_workers=AI_MAX_CONCURRENT_JOBS, max_queued_per_user=AI_MAX_QUEUED_PER_USER):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-job")
+        self.max_queued_per_user = max_queued_per_user
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.queues = {}  # usuario -> deque de trabajos pendientes
+        self.running = {}  # usuario -> trabajo en curso
+
+    def submit(self, user, fragments, metrics=None, **info):
+        """
+        Encola el consumo de fragments (iterable perezoso de fragmentos de texto, p. ej.
+        el generador de stream_with_cache); metrics es el dict que ese generador rellena.
+
+        Devuelve el AIJob, o None si el usuario ya tiene la cola llena.
+        """
+        self._cleanup()
+        with self.lock:
+            queue = self.queues.setdefault(user, deque())
+            if len(queue) >= self.max_queued_per_user:
+                return None
+
+            job = AIJob(user, fragments, metrics, **info)
+            self.jobs[job.id] = job
+            if user in self.running:
+                queue.append(job)
+            else:
+                self._start(job)
+            return job
+
+    def get(self, job_id):
+        """Devuelve el trabajo con ese id (o None si ya caducó)"""
+        return self.jobs.get(job_id)
+
+    def _start(self, job):
+        """Lanza un trabajo en el pool (llamar con el lock tomado)"""
+        self.running[job.user] = job
+        self.executor.submit(self._run, job)
+
+    def _run(self, job):
+        """Ejecuta el trabajo acumulando el texto y arranca el siguiente del mismo usuario"""
+        job.status = "en_curso"
+        try:
+            for fragmento in job.fragments:
+                job.text += fragmento
+            job.status = "completado"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "error"
+        finally:
+            job.fragments = None
+            job.finished_at = time.time()
+            with self.lock:
+                self.running.pop(job.user, None)
+                queue = self.queues.get(job.user)
+                if queue:
+                    self._start(queue.popleft())
+
+    def _cleanup(self):
+        """Olvida los trabajos terminados hace más de AI_JOB_RESULT_TTL"""
+        limite = time.time() - AI_JOB_RESULT_TTL
+        with self.lock:
+            for job_id in [j.id for j in self.jobs.values() if j.done and j.finished_at < limite]:
+                del self.jobs[job_id]
+            for user in [u for u, q in self.queues.items() if not q and u not in self.running]:
+                del self.queues[user]
+
+
+@st.cache_resource
+def get_ai_job_runner():
+    """Pool de análisis de IA compartido por todas las sesiones del proceso"""
+    return AIJobRunner()
@@ -0,0 +1,177 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+import pandas as pd
+import streamlit as st
+from ai_context import note_line, truncate_text
+
+# Registros del historial que se añaden al prompt de una pregunta
+RETRIEVAL_TOP_K = 8
+# Parámetros de BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Longitud de la raíz de cada palabra (stemming mínimo: "cambié" y "cambio" -> "cambi")
+STEM_CHARS = 5
+
+# Números con decimales ("7.8", "7,8") como un solo término; el resto, palabras
+NUMBER_RE = re.compile(r"[0-9]+(?:[.,][0-9]+)?")
+TOKEN_RE = re.compile(r"[0-9]+(?:[.,][0-9]+)?|[a-z0-9]+")
+
+# Palabras vacías que no aportan a la búsqueda
+STOPWORDS = {
+    'a', 'al', 'algo', 'como', 'con', 'cual', 'cuando', 'de', 'del', 'donde', 'el', 'en', 'es', 'esta',
+    'este', 'ha', 'hay', 'he', 'la', 'las', 'le', 'lo', 'los', 'me', 'mi', 'mis', 'muy', 'no', 'o',
+    'para', 'pero', 'por', 'porque', 'que', 'qué', 'se', 'si', 'sin', 'su', 'sus', 'tan', 'te', 'tu',
+    'un', 'una', 'uno', 'y', 'ya', 'fue', 'era', 'son', 'ser', 'debo', 'puedo', 'hace', 'vez', 'ultima',
+}
+
+
+def is_number(termino):
+    """True si el término es un número (p. ej. un valor medido: "7.8", "3500")"""
+    return NUMBER_RE.fullmatch(termino) is not None
+
+def tokenize(texto, stopwords=STOPWORDS):
+    """Minúsculas, sin tildes ni palabras vacías y recortado a la raíz; los números se conservan enteros"""
+    texto = unicodedata.normalize('NFKD', str(texto).lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    terminos = []
+    for palabra in TOKEN_RE.findall(texto):
+        if is_number(palabra):
+            terminos.append(palabra.replace(',', '.'))
+        elif palabra not in stopwords and len(palabra) > 1:
+            terminos.append(palabra[:STEM_CHARS])
+    return terminos
+
+def _has_text(valor):
+    return pd.notna(valor) and str(valor).strip() != ""
+
+def _measurement_docs(df):
+    """(texto a indexar, línea para el prompt, línea en la sección de notas) de las mediciones con notas"""
+    docs = []
+    if 'Notas' not in df.columns:
+        return docs
+    for _, row in df.iterrows():
+        if not _has_text(row['Notas']):
+            continue
+        fecha = row['Dia'].strftime('%d/%m/%Y')
+        valores = ", ".join(f"{p}={row[p]}" for p in ('pH', 'Sal', 'FAC', 'ORP') if p in row and pd.notna(row[p]))
+        docs.append((str(row['Notas']), f"• Medición {fecha} ({valores}): {truncate_text(row['Notas'])}",
+                     note_line(row['Dia'], row['Notas'])))
+    return docs
+
+def _maintenance_docs(maint_df):
+    """(texto a indexar, línea para el prompt, None) de cada mantenimiento (tipo y notas)"""
+    docs = []
+    for _, maint in maint_df.iterrows():
+        tipo = maint.get('Tipo', '')
+        notas = maint['Notas'] if 'Notas' in maint and _has_text(maint['Notas']) else ""
+        if not _has_text(tipo) and not notas:
+            continue
+        fecha = maint['Fecha'].strftime('%d/%m/%Y') if pd.notna(maint.get('Fecha')) else "sin fecha"
+        linea = f"• Mantenimiento {fecha}: {tipo}"
+        if notas:
+            linea += f" — {truncate_text(notas)}"
+        docs.append((f"{tipo} {notas}", linea, None))
+    return docs
+
+
+class HistoryIndex:
+    """
+    Índice invertido BM25 sobre las notas de mediciones y el historial de mantenimiento.
+
+    Como RollupStore, solo indexa las filas añadidas desde la última llamada; si las filas
+    ya indexadas cambian (edición o borrado en la hoja) se reconstruye esa fuente.
+    """
+
+    SOURCES = ('mediciones', 'mantenimiento')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = {source: 0 for source in self.SOURCES}
+        self.fingerprints = {source: None for source in self.SOURCES}
+        self.docs = {source: [] for source in self.SOURCES}  # [(línea, {término: frecuencia}, longitud, nota)]
+        self._postings = None
+        self._all_docs = []
+        self._avgdl = 0
+
+    def sync(self, df, maint_df):
+        """Incorpora las mediciones y mantenimientos nuevos"""
+        with self.lock:
+            self._sync_source('mediciones', df, 'Notas', _measurement_docs)
+            self._sync_source('mantenimiento', maint_df, 'Tipo', _maintenance_docs)
+
+    def _sync_source(self, source, frame, required_col, build_docs):
+        if frame is None or frame.empty or required_col not in frame.columns:
+            if self.rows[source]:
+                self.rows[source], self.fingerprints[source], self.docs[source] = 0, None, []
+                self._postings = None
+            return
+
+        cols = [c for c in ('Dia', 'Fecha', 'Tipo', 'Notas') if c in frame.columns]
+        hashes = pd.util.hash_pandas_object(frame[cols].astype(str), index=False)
+        procesadas = self.rows[source]
+        if len(frame) < procesadas or int(hashes.iloc[:procesadas].sum()) != self.fingerprints[source]:
+            procesadas = 0
+            self.docs[source] = []
+
+        nuevas = frame.iloc[procesadas:]
+        if not nuevas.empty:
+            for texto, linea, nota in build_docs(nuevas):
+                terms = Counter(tokenize(texto))
+                self.docs[source].append((linea, terms, sum(terms.values()), nota))
+            self._postings = None
+
+        self.rows[source] = len(frame)
+        self.fingerprints[source] = int(hashes.sum())
+
+    def _build_postings(self):
+        """Término -> [(documento, frecuencia)] sobre todas las fuentes"""
+        self._all_docs = [doc for source in self.SOURCES for doc in self.docs[source]]
+        postings = defaultdict(list)
+        for doc_id, (_, terms, _, _) in enumerate(self._all_docs):
+            for term, tf in terms.items():
+                postings[term].append((doc_id, tf))
+        self._postings = postings
+        self._avgdl = sum(doc[2] for doc in self._all_docs) / len(self._all_docs) if self._all_docs else 0
+
+    def search(self, query, k=RETRIEVAL_TOP_K, exclude=()):
+        """Devuelve las k líneas más relevantes para la consulta (por puntuación BM25), sin las notas de exclude"""
+        with self.lock:
+            if self._postings is None:
+                self._build_postings()
+            n_docs = len(self._all_docs)
+            if not n_docs:
+                return []
+
+            scores = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings:
+                    dl = self._all_docs[doc_id][2]
+                    scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * dl / self._avgdl))
+
+            # A igual puntuación, primero los registros más recientes
+            candidatos = [doc_id for doc_id in scores if self._all_docs[doc_id][3] not in exclude]
+            mejores = sorted(candidatos, key=lambda doc_id: (scores[doc_id], doc_id), reverse=True)[:k]
+            return [self._all_docs[doc_id][0] for doc_id in mejores]
+
+
+@st.cache_resource
+def _get_history_index(spreadsheet_id):
+    """Un índice por hoja de cálculo, compartido entre sesiones"""
+    return HistoryIndex()
+
+def retrieve_relevant_records(spreadsheet_id, df, maint_df, pregunta, k=RETRIEVAL_TOP_K, notas=""):
+    """
+    Registros del historial completo más relacionados con la pregunta, listos para el prompt.
+    Se omiten las notas que ya están en la sección de notas del contexto (notas).
+    """
+    index = _get_history_index(spreadsheet_id)
+    index.sync(df, maint_df)
+    lineas = index.search(pregunta, k, exclude=set(notas.splitlines()))
+    return "\n".join(lineas) if lineas else "No hay registros del historial relacionados con la pregunta"
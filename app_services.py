@@ -0,0 +1,191 @@
+import streamlit as st
+from sheets_data import get_pool_info
+from sheet_state import get_sheet_state
+
+# Cada cuánto se comprueban las escrituras en Google Sheets lanzadas en segundo plano (segundos)
+SHEETS_SYNC_POLL_SECONDS = 2
+# Marca de session_state: un fragmento ha encolado una escritura y hay que relanzar la app
+SHEETS_SYNC_REQUEST_KEY = "sheet_sync_requested"
+
+
+# Configuración de Google Sheets
+@st.cache_resource
+def init_google_sheets(spreadsheet_id):
+    """Inicializa la conexión con Google Sheets para el usuario autenticado"""
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    try:
+        scope = ['https://spreadsheets.google.com/feeds',
+                 'https://www.googleapis.com/auth/drive']
+
+        creds_dict = {
+            "type": st.secrets["gcp_service_account"]["type"],
+            "project_id": st.secrets["gcp_service_account"]["project_id"],
+            "private_key_id": st.secrets["gcp_service_account"]["private_key_id"],
+            "private_key": st.secrets["gcp_service_account"]["private_key"],
+            "client_email": st.secrets["gcp_service_account"]["client_email"],
+            "client_id": st.secrets["gcp_service_account"]["client_id"],
+            "auth_uri": st.secrets["gcp_service_account"]["auth_uri"],
+            "token_uri": st.secrets["gcp_service_account"]["token_uri"],
+        }
+
+        credentials = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
+        gc = gspread.authorize(credentials)
+
+        # Abrir hoja del usuario
+        spreadsheet = gc.open_by_key(spreadsheet_id)
+        main_sheet = spreadsheet.sheet1  # Primera hoja (por defecto)
+
+        # Segunda hoja: Mantenimiento
+        try:
+            maintenance_sheet = spreadsheet.worksheet("Mantenimiento")
+        except:
+            maintenance_sheet = spreadsheet.add_worksheet(title="Mantenimiento", rows="1000", cols="6")
+            maintenance_sheet.append_row(["Fecha", "Tipo", "Estado_Antes", "Tiempo_Minutos", "Notas", "Proximo_Mantenimiento"])
+
+        # Tercera hoja: Información de la piscina
+        try:
+            info_sheet = spreadsheet.worksheet("Info_Piscina")
+        except:
+            try:
+                info_sheet = spreadsheet.add_worksheet(title="Info_Piscina", rows="50", cols="3")
+                info_sheet.update('A1:C1', [["Campo", "Valor", "Notas"]])
+
+                basic_data = [
+                    ["Volumen_Litros", "0", "Volumen total en litros"],
+                    ["Largo_Metros", "0", "Largo en metros"],
+                    ["Ancho_Metros", "0", "Ancho en metros"],
+                    ["Profundidad_Metros", "0", "Profundidad promedio"],
+                    ["Ubicacion", "", "Ubicación de la piscina"],
+                    ["Fecha_Instalacion", "", "Fecha de instalación"],
+                    ["Bomba_Modelo", "", "Modelo de la bomba"],
+                    ["Filtro_Tipo", "", "Tipo de filtro"],
+                    ["Clorador_Modelo", "", "Modelo clorador salino"],
+                    ["Generador_Porcentaje", "50", "% actual del generador"],
+                    ["Notas_Generales", "", "Notas importantes"]
+                ]
+
+                for i, row in enumerate(basic_data):
+                    try:
+                        info_sheet.update(f'A{i+2}:C{i+2}', [row])
+                    except:
+                        pass
+            except Exception as e:
+                try:
+                    info_sheet = spreadsheet.add_worksheet(title="Info_Piscina", rows="10", cols="3")
+                    info_sheet.update('A1', "Campo")
+                    info_sheet.update('B1', "Valor") 
+                    info_sheet.update('C1', "Notas")
+                except:
+                    info_sheet = None
+                    st.warning("⚠️ No se pudo crear la hoja Info_Piscina. Funcionalidad limitada.")
+
+        return main_sheet, maintenance_sheet, info_sheet
+
+    except Exception as e:
+        st.error(f"❌ Error conectando con Google Sheets: {e}")
+        return None, None, None
+
+
+class AppServices:
+    """
+    Servicios de datos compartidos que app.py inyecta en cada página: las hojas del usuario,
+    la copia local con escrituras optimistas (SheetState) y la información de la piscina.
+    """
+
+    def __init__(self, spreadsheet_id, main_sheet, maintenance_sheet, info_sheet):
+        self.spreadsheet_id = spreadsheet_id
+        self.main_sheet = main_sheet
+        self.maintenance_sheet = maintenance_sheet
+        self.info_sheet = info_sheet
+
+    @property
+    def state(self):
+        return get_sheet_state(self.spreadsheet_id)
+
+    def measurements(self):
+        """Mediciones (copia local con los cambios pendientes aplicados)"""
+        return self.state.measurements(self.main_sheet)
+
+    def maintenance(self):
+        """Registros de mantenimiento (copia local con los cambios pendientes aplicados)"""
+        return self.state.maintenance(self.maintenance_sheet)
+
+    def pool_info(self):
+        """Información de la piscina (hoja Info_Piscina)"""
+        return get_pool_info(self.info_sheet)
+
+    def add_data_to_sheets(self, data):
+        """Añade una nueva fila de datos: se ve al instante y se guarda en Google Sheets en segundo plano"""
+        try:
+            self.state.append_measurement(self.main_sheet, data)
+            return True
+        except Exception as e:
+            st.error(f"Error guardando datos: {e}")
+            return False
+
+    def clear_maintenance_alert_by_data(self, tipo_mantenimiento, fecha_programada):
+        """
+        Borra la alerta de mantenimiento buscando por tipo y fecha exacta (al instante en la app;
+        si Google Sheets rechaza el cambio, el recordatorio vuelve a aparecer)
+        """
+        try:
+            self.state.clear_reminder(self.maintenance_sheet, tipo_mantenimiento, fecha_programada)
+            return True
+        except Exception as e:
+            st.error(f"Error borrando alerta: {e}")
+            return False
+
+    def add_maintenance_to_sheets(self, data):
+        """Añade una nueva fila de mantenimiento: se ve al instante y se guarda en segundo plano"""
+        try:
+            self.state.append_maintenance(self.maintenance_sheet, data)
+            return True
+        except Exception as e:
+            st.error(f"Error guardando mantenimiento: {e}")
+            return False
+
+
+def get_app_services(spreadsheet_id):
+    """Servicios de la hoja de cálculo del usuario, o None si no se pudo conectar con Google Sheets"""
+    main_sheet, maintenance_sheet, info_sheet = init_google_sheets(spreadsheet_id)
+    if main_sheet is None or maintenance_sheet is None:
+        return None
+    return AppServices(spreadsheet_id, main_sheet, maintenance_sheet, info_sheet)
+
+def _render_sheet_sync(services, polling=False):
+    """
+    Confirma las escrituras en segundo plano. Si alguna falla, la copia local ya la ha
+    deshecho: se guarda el aviso y se repinta toda la página con los datos correctos.
+    """
+    state = services.state
+    state.reconcile()
+    errores = state.pop_errors()
+    if errores:
+        st.session_state.setdefault("sheet_sync_errors", []).extend(errores)
+        st.rerun()
+    if state.pending:
+        st.caption(f"⏳ Guardando {len(state.pending)} cambio(s) en Google Sheets...")
+    elif polling:
+        # Todo confirmado: se relanza el script para dejar de sondear
+        st.rerun()
+
+def show_sheet_sync(services):
+    """Seguimiento de las escrituras en Google Sheets (sondeando solo si hay alguna pendiente)"""
+    pendiente = bool(services.state.pending)
+    fragmento = st.fragment(_render_sheet_sync, run_every=SHEETS_SYNC_POLL_SECONDS if pendiente else None)
+    fragmento(services, polling=pendiente)
+
+def request_sheet_sync():
+    """Marca que se acaba de encolar una escritura (se puede llamar desde un callback)"""
+    st.session_state[SHEETS_SYNC_REQUEST_KEY] = True
+
+def start_sheet_sync(services):
+    """
+    Para los fragmentos que escriben en Google Sheets: un rerun del fragmento no vuelve a
+    pintar show_sheet_sync, así que si se pidió con request_sheet_sync y la escritura sigue
+    pendiente se relanza toda la app para que empiece a sondear.
+    """
+    if st.session_state.pop(SHEETS_SYNC_REQUEST_KEY, False) and services.state.pending:
+        st.rerun(scope="app")
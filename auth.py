@@ -1,51 +1,179 @@
-# ✅ LÓGICA MEJORADA CON COOKIES - Verificar en este orden:
-
-# 0️⃣ PRIMERO: ¿Auto-login desde cookies?
-if "user_email" not in st.session_state:
-    if check_auto_login():
-        # Auto-login exitoso desde cookies
-        if st.session_state.get("auto_logged_in"):
-            st.success(f"✅ Bienvenido de nuevo, {st.session_state['user_email']}")
-            del st.session_state["auto_logged_in"]  # Solo mostrar una vez
-
-# 1️⃣ SEGUNDO: ¿Hay código OAuth en query params?
-query_params = st.query_params.to_dict()
-if "code" in query_params and "oauth_processed" not in st.session_state:
-    st.write("🔄 Procesando credenciales OAuth...")
-    email = process_oauth_code(query_params["code"])
-    if email:
-        st.session_state["user_email"] = email
-        st.session_state["just_logged_in"] = True
-        st.session_state["oauth_processed"] = True
-        
-        # NUEVO: Guardar en cookies para próximas sesiones
-        if save_user_to_cookies(email, st.session_state.get("user_picture")):
-            st.session_state["cookies_saved"] = True
-        
-        st.query_params.clear()
-        st.rerun()
+"""
+Inicio de sesión con Google (OAuth): pantalla de login, canje del código y registro de la sesión.
+
+Es el único camino de login de la app. authlib solo se importa al canjear el código, no en
+cada ejecución del script.
+"""
+import streamlit as st
+import requests
+import urllib.parse
+from cookie_auth import start_server_session
+from id_token import IDTokenError, verify_id_token
+from user_lookup import get_user_spreadsheet_id
+
+def _register_session(email, picture):
+    """Guarda la sesión con su hoja de cálculo para no volver a consultar el archivo maestro"""
+    try:
+        spreadsheet_id = get_user_spreadsheet_id(email)
+    except ValueError:
+        return  # Usuario no autorizado o inactivo: la app mostrará el error
+    start_server_session(email, spreadsheet_id, picture)
+
+def _user_info_from_token(client_id, token):
+    """Claims del ID token verificado; si no se puede verificar, se consulta userinfo"""
+    from authlib.integrations.requests_client import OAuth2Session
 
-# 2️⃣ TERCERO: ¿Usuario ya autenticado en session_state?
-if "user_email" in st.session_state:
-    email = st.session_state["user_email"]
+    if token.get("id_token"):
+        try:
+            claims = verify_id_token(token["id_token"], client_id)
+            if claims.get("email") and claims.get("email_verified", True):
+                return claims
+        except (IDTokenError, requests.RequestException):
+            pass
     
-    # Mostrar mensaje de bienvenida solo una vez
-    if st.session_state.get("just_logged_in"):
-        st.success(f"✅ Bienvenido, {email}")
-        if st.session_state.get("cookies_saved"):
-            st.info("🍪 Sesión guardada - no necesitarás hacer login por 30 días")
-            del st.session_state["cookies_saved"]
-        del st.session_state["just_logged_in"]
+    session = OAuth2Session(client_id, token=token)
+    resp = session.get("https://openidconnect.googleapis.com/v1/userinfo")
+    return resp.json()
+
+def process_oauth_code(code):
+    """Procesa el código de autorización de Google y devuelve el email"""
+    from authlib.integrations.requests_client import OAuth2Session
+
+    try:
+        client_id = st.secrets["google_oauth"]["client_id"]
+        client_secret = st.secrets["google_oauth"]["client_secret"]
+        redirect_uri = st.secrets["google_oauth"]["redirect_uri"]
+        scope = ["openid", "email", "profile"]
+        
+        # Intercambiar código por token
+        oauth = OAuth2Session(client_id, client_secret, redirect_uri=redirect_uri, scope=scope)
+        token = oauth.fetch_token("https://oauth2.googleapis.com/token", code=code)
+        
+        # Obtener información del usuario del ID token (verificado en local, sin otra llamada a Google)
+        user_info = _user_info_from_token(client_id, token)
+        
+        email = user_info.get("email")
+        picture = user_info.get("picture")
+        
+        if email:
+            if picture:
+                st.session_state["user_picture"] = picture
+            _register_session(email, picture)
+            return email
+        else:
+            st.error("❌ No se pudo obtener el email del usuario.")
+            return None
+            
+    except Exception as e:
+        st.error(f"❌ Error durante la autenticación: {str(e)}")
+        return None
+
+def show_login_screen():
+    """Pantalla de login simple y funcional"""
+    client_id = st.secrets["google_oauth"]["client_id"]
+    redirect_uri = st.secrets["google_oauth"]["redirect_uri"]
+    scope = ["openid", "email", "profile"]
+    scope_str = urllib.parse.quote_plus(" ".join(scope))
     
-    # Extender sesión si está activo (silencioso)
-    extend_session()
+    # ✅ URL MÍNIMA que funciona
+    auth_url = (
+        f"https://accounts.google.com/o/oauth2/auth?"
+        f"response_type=code&"
+        f"client_id={client_id}&"
+        f"redirect_uri={redirect_uri}&"
+        f"scope={scope_str}"
+    )
     
-    # Buscar spreadsheet_id
-    try:
-        spreadsheet_id = get_user_spreadsheet_id(email)
-    except ValueError as e:
-        st.error(str(e))
-        st.stop()
+    # Header principal simple
+    st.markdown("""
+        <div style="
+            text-align: center;
+            background: linear-gradient(90deg, #4285f4, #34a853);
+            color: white;
+            padding: 40px 20px;
+            border-radius: 10px;
+            margin: 20px 0;
+        ">
+            <h1>🔐 Pool Master</h1>
+            <p>Accede con tu cuenta de Google o crea una nueva</p>
+        </div>
+    """, unsafe_allow_html=True)
     
-    # ✅ AQUÍ EMPIEZA TU APP PRINCIPAL (CSS y contenido)
-    # ... resto de tu código actual sin cambios ...
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Columnas para centrar
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        # ✅ USAR SOLO ENLACE DIRECTO (que funcionaba)
+        st.markdown("### 🔗 Iniciar sesión")
+        st.markdown(f"[**🚀 Iniciar sesión con Google**]({auth_url})")
+        
+        # Separador
+        st.markdown("---")
+        
+        # Sección nuevo usuario
+        st.markdown("### 👤 ¿Primera vez aquí?")
+        st.write("Crear una cuenta es rápido y sencillo. Solo necesitas tu email de Google.")
+        
+        if st.button("➕ Crear nueva cuenta", 
+                    key="signup_btn", 
+                    use_container_width=True,
+                    type="secondary"):
+            st.session_state["show_signup_form"] = True
+            st.rerun()
+            
+    
+    # Mostrar formulario de registro si se activó
+    if st.session_state.get("show_signup_form"):
+        _show_signup_form()
+
+def _show_signup_form():
+    """Formulario de registro para nuevos usuarios"""
+    st.markdown("---")
+    st.markdown("### 📝 Registro de nuevo usuario")
+    
+    with st.form("signup_form"):
+        st.markdown("**Información básica:**")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            nombre = st.text_input("Nombre completo", placeholder="Ej: Juan Pérez")
+            email = st.text_input("Email", placeholder="tu.email@gmail.com")
+        
+        with col2:
+            telefono = st.text_input("Teléfono (opcional)", placeholder="+34 123 456 789")
+            empresa = st.text_input("Empresa/Organización", placeholder="Ej: Piscinas ABC")
+        
+        mensaje = st.text_area("¿Por qué necesitas acceso?", 
+                              placeholder="Describe brevemente para qué necesitas usar la aplicación...")
+        
+        submitted = st.form_submit_button("📨 Enviar solicitud", 
+                                        use_container_width=True,
+                                        type="primary")
+        
+        if submitted:
+            if nombre and email:
+                st.success(f"""
+                ✅ **Solicitud enviada correctamente**
+                
+                Hemos recibido tu solicitud de registro:
+                - **Nombre:** {nombre}
+                - **Email:** {email}
+                - **Empresa:** {empresa or 'No especificada'}
+                
+                Te contactaremos pronto para activar tu cuenta.
+                """)
+                
+                # Limpiar el formulario
+                if "show_signup_form" in st.session_state:
+                    del st.session_state["show_signup_form"]
+            else:
+                st.error("⚠️ Por favor completa al menos el nombre y email.")
+    
+    # Botón para volver
+    if st.button("⬅️ Volver al login", key="back_to_login"):
+        if "show_signup_form" in st.session_state:
+            del st.session_state["show_signup_form"]
+        st.rerun()
@@ -0,0 +1,100 @@
+"""
+Pre-genera el análisis de tendencias de todos los usuarios activos y lo deja en la caché de la IA.
+
+Cuando el usuario pulsa "Analizar Tendencias" el Dashboard construye exactamente el mismo
+prompt, así que la respuesta sale de la caché al instante. Solo se llama a la IA para los
+usuarios cuyo análisis no está ya en caché (datos nuevos o caducado), por lo que se puede
+programar cada pocos minutos para cubrir las mediciones recién añadidas, además de una
+pasada en horas valle. Ejemplo de cron:
+
+    0 5 * * *    cd /ruta/app && python batch_ai.py
+    */15 7-22 * * *  cd /ruta/app && python batch_ai.py --workers 2
+
+Uso: python batch_ai.py [--workers N] [--dry-run]
+"""
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from ai_cache import get_ai_cache, stream_with_cache
+from ai_client import AIUnavailableError, get_llm_client
+from ai_context import ai_data_version, build_ai_context, build_analysis_prompt, log_prompt_size
+from sheets_data import get_data_from_sheets, get_maintenance_data, get_pool_info
+from user_lookup import get_active_users, get_service_client
+
+logger = logging.getLogger("batch_ai")
+
+# Usuarios procesados en paralelo (lecturas de Google Sheets y llamadas a la IA)
+BATCH_MAX_WORKERS = 4
+
+
+def _load_user_data(client, spreadsheet_id):
+    """Mediciones, mantenimiento e info de piscina de un usuario (sin crear hojas que falten)"""
+    spreadsheet = client.open_by_key(spreadsheet_id)
+    worksheets = {ws.title: ws for ws in spreadsheet.worksheets()}
+
+    df = get_data_from_sheets(spreadsheet.sheet1)
+    maint_df = get_maintenance_data(worksheets["Mantenimiento"]) if "Mantenimiento" in worksheets else pd.DataFrame()
+    pool_info = get_pool_info(worksheets.get("Info_Piscina"))
+    return df, maint_df, pool_info
+
+def precompute_user(client, llm, email, spreadsheet_id, dry_run=False):
+    """Genera y guarda en caché el análisis de un usuario; devuelve el resultado ('generado', 'en_cache', ...)"""
+    df, maint_df, pool_info = _load_user_data(client, spreadsheet_id)
+    if df.empty:
+        return "sin_datos"
+
+    contexto = build_ai_context(df, maint_df, pool_info, ai_data_version(df, maint_df, pool_info))
+    prompt = build_analysis_prompt(contexto)
+    log_prompt_size(f"batch {email}", prompt)
+
+    cache = get_ai_cache()
+    if cache.get(cache.make_key(llm.model_name, prompt)) is not None:
+        return "en_cache"
+    if dry_run:
+        return "pendiente"
+
+    # stream_with_cache guarda la respuesta completa al terminar
+    "".join(stream_with_cache(llm, llm.model_name, prompt))
+    return "generado"
+
+def run_batch(workers=BATCH_MAX_WORKERS, dry_run=False):
+    """Recorre los usuarios activos con paralelismo acotado y devuelve {resultado: número de usuarios}"""
+    start = time.perf_counter()
+    client = get_service_client()
+    llm = get_llm_client()
+    users = get_active_users(client)
+    logger.info("Usuarios activos: %d", len(users))
+
+    resumen = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-ai") as executor:
+        futures = {
+            executor.submit(precompute_user, client, llm, email, spreadsheet_id, dry_run): email
+            for email, spreadsheet_id in users
+        }
+        for future in as_completed(futures):
+            email = futures[future]
+            try:
+                resultado = future.result()
+            except AIUnavailableError as e:
+                resultado = "ia_no_disponible"
+                logger.warning("%s: %s", email, e)
+            except Exception as e:
+                resultado = "error"
+                logger.exception("%s: %s", email, e)
+            logger.info("%s: %s", email, resultado)
+            resumen[resultado] = resumen.get(resultado, 0) + 1
+
+    logger.info("Terminado en %.1fs: %s", time.perf_counter() - start, resumen)
+    return resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-genera los análisis de IA de los usuarios activos")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="usuarios en paralelo")
+    parser.add_argument("--dry-run", action="store_true", help="solo indica qué análisis faltan en caché")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run_batch(workers=max(args.workers, 1), dry_run=args.dry_run)
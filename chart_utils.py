@@ -0,0 +1,261 @@
+import json
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Parámetros numéricos que se agregan
+PARAMETROS = ['pH', 'Conductividad', 'TDS', 'Sal', 'ORP', 'FAC', 'Temperatura']
+
+# Agrupaciones disponibles (de más fina a más gruesa) -> frecuencia de pandas
+ROLLUP_BUCKETS = {
+    'Diaria': 'D',
+    'Semanal': 'W-SUN',  # Semanas de lunes a domingo
+    'Mensual': 'M',
+}
+
+# Duración aproximada en días de cada agrupación
+BUCKET_DAYS = {'Diaria': 1, 'Semanal': 7, 'Mensual': 30}
+
+# Puntos máximos por serie antes de pasar a datos agrupados
+MAX_CHART_POINTS = 400
+
+# Puntos objetivo por traza tras el submuestreo (LTTB)
+DOWNSAMPLE_TARGET_POINTS = 800
+MOBILE_DOWNSAMPLE_TARGET_POINTS = 400
+
+# A partir de este número de puntos por traza se dibuja con WebGL (Scattergl)
+WEBGL_POINT_THRESHOLD = 500
+# Puntos objetivo por traza en modo "alto rendimiento" (siempre WebGL)
+HIGH_PERFORMANCE_TARGET_POINTS = 20000
+
+# Decimales enviados al navegador por parámetro (los mismos con los que se guardan las mediciones)
+CHART_DECIMALS = {'pH': 2, 'FAC': 2, 'Temperatura': 1, 'Conductividad': 0, 'TDS': 0, 'Sal': 0, 'ORP': 0}
+
+# Memoria máxima de la caché de figuras serializadas (bytes)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _partial_aggregates(df, freq):
+    """Calcula min/max/suma/conteo por periodo (agregados combinables)"""
+    params = [p for p in PARAMETROS if p in df.columns]
+    bucket = df['Dia'].dt.to_period(freq).dt.start_time
+    grouped = df[params].groupby(bucket)
+    return pd.concat(
+        {'min': grouped.min(), 'max': grouped.max(), 'sum': grouped.sum(), 'count': grouped.count()},
+        axis=1
+    )
+
+def _merge_partials(previo, nuevo):
+    """Combina los agregados existentes con los de las filas nuevas"""
+    combinado = pd.concat([previo, nuevo])
+    # min y max se combinan igual; suma y conteo se acumulan
+    agg = {col: col[0] if col[0] in ('min', 'max') else 'sum' for col in combinado.columns}
+    return combinado.groupby(level=0).agg(agg).sort_index()
+
+def _finalize(partials):
+    """Convierte los agregados en un DataFrame listo para gráficos y tablas"""
+    result = pd.DataFrame(index=partials.index)
+    for param in partials['sum'].columns:
+        count = partials['count'][param]
+        result[param] = (partials['sum'][param] / count.where(count > 0)).round(3)
+        result[f'{param}_min'] = partials['min'][param]
+        result[f'{param}_max'] = partials['max'][param]
+        result[f'{param}_count'] = count.astype(int)
+    result.index.name = 'Fecha_Completa'
+    return result.reset_index()
+
+def _row_hashes(df):
+    """Hash por fila de las columnas que intervienen en los agregados"""
+    cols = ['Dia'] + [p for p in PARAMETROS if p in df.columns]
+    return pd.util.hash_pandas_object(df[cols], index=False)
+
+
+class RollupStore:
+    """Agregados diarios/semanales/mensuales de una hoja, mantenidos de forma incremental"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = 0
+        self.fingerprint = None
+        self.partials = {}
+        self.views = {}
+
+    def update(self, df):
+        """Incorpora las filas nuevas de df y devuelve los agregados por agrupación"""
+        with self.lock:
+            hashes = _row_hashes(df)
+
+            # Si las filas ya procesadas han cambiado (edición/borrado en la hoja) se recalcula todo
+            if len(df) < self.rows or int(hashes.iloc[:self.rows].sum()) != self.fingerprint:
+                self.rows = 0
+                self.partials = {}
+
+            nuevas = df.iloc[self.rows:]
+            if not nuevas.empty:
+                for bucket, freq in ROLLUP_BUCKETS.items():
+                    parcial = _partial_aggregates(nuevas, freq)
+                    previo = self.partials.get(bucket)
+                    self.partials[bucket] = parcial if previo is None else _merge_partials(previo, parcial)
+                self.views = {bucket: _finalize(p) for bucket, p in self.partials.items()}
+
+            self.rows = len(df)
+            self.fingerprint = int(hashes.sum())
+            return self.views
+
+
+@st.cache_resource
+def _get_rollup_store(spreadsheet_id):
+    """Un almacén de agregados por hoja de cálculo, compartido entre sesiones"""
+    return RollupStore()
+
+def get_rollups(spreadsheet_id, df):
+    """Devuelve {agrupación: DataFrame agregado} para los datos de la hoja"""
+    if df.empty:
+        return {}
+    return _get_rollup_store(spreadsheet_id).update(df)
+
+def choose_bucket(n_rows, span_days, max_points=MAX_CHART_POINTS):
+    """Elige la agrupación más fina que mantiene el gráfico por debajo de max_points (None = sin agrupar)"""
+    if n_rows <= max_points:
+        return None
+    for bucket, days in BUCKET_DAYS.items():
+        if span_days / days <= max_points:
+            return bucket
+    return 'Mensual'
+
+
+def lttb_indices(x, y, n_out, lo=None, hi=None):
+    """
+    Índices a conservar según Largest-Triangle-Three-Buckets.
+
+    Si se indica el rango óptimo (lo, hi), en los tramos con valores fuera de rango
+    se conserva el más alejado del rango en lugar del elegido por LTTB, para que
+    los extremos sigan visibles en el gráfico.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Distancia de cada punto al rango óptimo (0 si está dentro)
+    deviation = np.zeros(n)
+    if lo is not None:
+        deviation = np.maximum(deviation, lo - y)
+    if hi is not None:
+        deviation = np.maximum(deviation, y - hi)
+
+    # Primer y último punto siempre se conservan; el resto se reparte en n_out - 2 tramos
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        if deviation[start:end].max() > 0:
+            b = start + int(np.argmax(deviation[start:end]))
+        else:
+            # Media del tramo siguiente (o último punto)
+            next_end = edges[i + 2] if i + 2 < len(edges) else n
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
+
+            areas = np.abs(
+                (x[a] - avg_x) * (y[start:end] - y[a]) -
+                (x[a] - x[start:end]) * (avg_y - y[a])
+            )
+            b = start + int(np.argmax(areas))
+
+        selected[i + 1] = b
+        a = b
+
+    return selected
+
+def downsample_frame(df, x_col, y_col, n_out=DOWNSAMPLE_TARGET_POINTS, lo=None, hi=None):
+    """Reduce df a n_out filas representativas de la serie y_col (sin valores nulos)"""
+    serie = df[df[y_col].notna()]
+    if len(serie) <= n_out:
+        return serie
+    x = serie[x_col].values.astype('datetime64[ns]').astype(np.int64)
+    idx = lttb_indices(x, serie[y_col].values, n_out, lo, hi)
+    return serie.iloc[idx]
+
+def use_webgl(n_points, high_performance=False):
+    """Indica si una traza de n_points debe dibujarse con WebGL en lugar de SVG"""
+    return high_performance or n_points > WEBGL_POINT_THRESHOLD
+
+def encode_dates(fechas):
+    """Fechas como milisegundos desde epoch (Plotly las envía como array binario en lugar de texto ISO)"""
+    return np.asarray(fechas, dtype='datetime64[ns]').astype('datetime64[ms]').astype(np.float64)
+
+def encode_values(values, decimals=2):
+    """
+    Redondea los valores a la precisión real de la medición y usa el tipo numérico
+    más pequeño posible, para que Plotly los envíe como array binario compacto.
+    """
+    arr = np.round(np.asarray(values, dtype=np.float64), decimals)
+    if decimals == 0 and np.isfinite(arr).all():
+        if np.abs(arr).max(initial=0) < 2 ** 15:
+            return arr.astype(np.int16)
+        if np.abs(arr).max(initial=0) < 2 ** 31:
+            return arr.astype(np.int32)
+    return arr.astype(np.float32)
+
+
+class FigureCache:
+    """Caché LRU de figuras Plotly serializadas, acotada por memoria"""
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.lock = threading.Lock()
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Devuelve el JSON de la figura o None, marcándola como usada recientemente"""
+        with self.lock:
+            fig_json = self.entries.get(key)
+            if fig_json is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return fig_json
+
+    def put(self, key, fig_json):
+        """Guarda el JSON de una figura y expulsa las menos usadas si se supera el límite"""
+        size = len(fig_json)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            self.entries[key] = fig_json
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def get_or_build(self, key, builder):
+        """Devuelve la figura (como dict) desde la caché o la construye con builder()"""
+        fig_json = self.get(key)
+        if fig_json is None:
+            fig_json = builder().to_json()
+            self.put(key, fig_json)
+        return json.loads(fig_json)
+
+
+@st.cache_resource
+def get_figure_cache():
+    """Caché de figuras compartida por todo el proceso"""
+    return FigureCache()
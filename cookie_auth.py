@@ -1,139 +1,314 @@
 import streamlit as st
-from streamlit_cookies_manager import EncryptedCookieManager
+import streamlit.components.v1 as components
+import base64
+import hashlib
+import hmac
 import time
 import json
+import logging
+from session_store import get_session_store
+from user_lookup import get_user_spreadsheet_id
+
+logger = logging.getLogger(__name__)
 
 # Configuración de cookies
 COOKIE_EXPIRY_DAYS = 30  # Las cookies duran 30 días
-COOKIE_PASSWORD = "pool_master_secret_2024"  # Cambia por algo único
+COOKIE_PASSWORD = "pool_master_secret_2024"  # Solo para leer las cookies antiguas (EncryptedCookieManager)
+
+# Renovación de la sesión: solo cuando quedan menos de estos días de validez
+SESSION_RENEW_THRESHOLD_DAYS = 7
+# ... y como mucho una vez por sesión de navegador en este intervalo (segundos)
+SESSION_RENEW_MIN_INTERVAL = 60 * 60
+
+# Cookie de sesión firmada (se lee en el servidor en la primera ejecución, sin esperar al navegador)
+SESSION_COOKIE_NAME = "pool_master_session"
+# Cookie de versiones anteriores (EncryptedCookieManager con prefijo "pool_master_")
+LEGACY_COOKIE_NAME = "pool_master_user_data"
+
+def _session_secret():
+    """
+    Clave para firmar las sesiones (SESSION_SECRET en secrets.toml), o None si no está configurada.
+
+    Sin ella no se emiten ni se aceptan cookies de sesión firmadas: el login solo dura lo
+    que la sesión del navegador.
+    """
+    try:
+        secret = st.secrets.get("SESSION_SECRET")
+    except Exception:
+        secret = None
+    return str(secret).encode("utf-8") if secret else None
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def sign_session_token(user_data):
+    """Token "datos.firma" (HMAC-SHA256) con los datos del usuario y su caducidad (None sin SESSION_SECRET)"""
+    secret = _session_secret()
+    if secret is None:
+        return None
+    payload = _b64encode(json.dumps(user_data, separators=(",", ":")).encode("utf-8"))
+    signature = hmac.new(secret, payload.encode("ascii"), hashlib.sha256).digest()
+    return f"{payload}.{_b64encode(signature)}"
+
+def verify_session_token(token):
+    """Devuelve los datos del token si la firma es válida y no ha caducado, o None"""
+    secret = _session_secret()
+    if secret is None:
+        return None
+    try:
+        payload, signature = token.split(".", 1)
+        expected = hmac.new(secret, payload.encode("ascii"), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            return None
+        user_data = json.loads(_b64decode(payload))
+    except (ValueError, AttributeError):
+        return None
+
+    if time.time() > user_data.get('expires', 0):
+        return None
+    return user_data
+
+def _request_cookies():
+    """Cookies de la petición HTTP que abrió la sesión (disponibles desde la primera ejecución)"""
+    try:
+        return st.context.cookies
+    except Exception:
+        return {}
+
+def _set_browser_cookie(name, value, max_age, redirect=None):
+    """Escribe (o borra con max_age=0) una cookie en el navegador"""
+    redirect_js = f"window.parent.location.href = {json.dumps(redirect)};" if redirect else ""
+    components.html(f"""
+        <script>
+            const secure = window.parent.location.protocol === 'https:' ? '; Secure' : '';
+            window.parent.document.cookie = {json.dumps(f"{name}={value}; max-age={max_age}; path=/; SameSite=Lax")} + secure;
+            {redirect_js}
+        </script>
+    """, height=0)
 
 def init_cookie_manager():
-    """Inicializa el gestor de cookies encriptadas"""
+    """Inicializa el gestor de cookies encriptadas (solo para migrar sesiones antiguas)"""
     try:
+        from streamlit_cookies_manager import EncryptedCookieManager
+
         # Solo inicializar una vez por sesión
         if 'cookies_initialized' not in st.session_state:
             cookies = EncryptedCookieManager(
                 prefix="pool_master_",
                 password=COOKIE_PASSWORD
             )
-            
+
             # Verificar que las cookies estén listas
             if not cookies.ready():
                 st.stop()
-            
+
             st.session_state.cookies = cookies
             st.session_state.cookies_initialized = True
-        
+
         return st.session_state.cookies
-    
+
     except Exception as e:
         st.error(f"Error inicializando cookies: {e}")
         return None
 
+def _load_legacy_cookie():
+    """Datos de la cookie encriptada antigua (requiere una ida y vuelta al navegador)"""
+    cookies = init_cookie_manager()
+    if cookies is None:
+        return None
+
+    user_data_str = cookies.get('user_data')
+    if not user_data_str:
+        return None
+    return json.loads(user_data_str)
+
+def start_server_session(email, spreadsheet_id, picture_url=None):
+    """Guarda la sesión en el servidor (usuario y hoja de cálculo) y la asocia a esta sesión de Streamlit"""
+    expires = time.time() + COOKIE_EXPIRY_DAYS * 24 * 60 * 60
+    st.session_state["session_token"] = get_session_store().create(email, spreadsheet_id, picture_url, expires)
+    st.session_state["spreadsheet_id"] = spreadsheet_id
+
 def save_user_to_cookies(email, picture_url=None):
-    """Guarda datos del usuario en cookies encriptadas"""
+    """
+    Guarda el usuario en una cookie de sesión firmada (se escribe en la siguiente ejecución).
+
+    Necesita la sesión del servidor (start_server_session): la cookie lleva su sid.
+    """
     try:
-        cookies = init_cookie_manager()
-        if cookies is None:
-            return False
-        
-        # Crear datos del usuario
+        # Crear datos del usuario (sid: sesión guardada en el servidor, si existe)
         user_data = {
             "email": email,
             "picture": picture_url,
+            "sid": st.session_state.get("session_token"),
             "login_time": time.time(),
             "expires": time.time() + (COOKIE_EXPIRY_DAYS * 24 * 60 * 60)
         }
-        
-        # Guardar en cookies
-        cookies['user_data'] = json.dumps(user_data)
-        cookies.save()
-        
+        # Sin sesión en el servidor la cookie no se podría revocar (ni se aceptaría al volver)
+        if not user_data["sid"]:
+            return False
+
+        token = sign_session_token(user_data)
+        if token is None:
+            logger.warning("SESSION_SECRET no está configurado en secrets.toml: no se guarda la sesión en cookies")
+            st.session_state["session_last_renewal"] = time.time()  # no reintentarlo en cada rerun
+            return False
+
+        if user_data["sid"]:
+            get_session_store().extend(user_data["sid"], user_data["expires"])
+
+        # Se escribe en flush_session_cookie para que un st.rerun() inmediato no la pierda
+        st.session_state["pending_session_cookie"] = token
+
+        # Recordar la caducidad para no volver a escribir la cookie en cada rerun
+        st.session_state["session_expires"] = user_data["expires"]
+        st.session_state["session_last_renewal"] = time.time()
+
         return True
-        
+
     except Exception as e:
         st.error(f"Error guardando en cookies: {e}")
         return False
 
+def flush_session_cookie():
+    """Envía al navegador la cookie de sesión pendiente, si la hay"""
+    token = st.session_state.pop("pending_session_cookie", None)
+    if token:
+        _set_browser_cookie(SESSION_COOKIE_NAME, token, COOKIE_EXPIRY_DAYS * 24 * 60 * 60)
+
 def load_user_from_cookies():
     """Carga datos del usuario desde cookies"""
     try:
-        cookies = init_cookie_manager()
-        if cookies is None:
-            return None
-        
-        # Verificar si existe cookie de usuario
-        user_data_str = cookies.get('user_data')
-        if not user_data_str:
-            return None
-        
-        # Parsear datos
-        user_data = json.loads(user_data_str)
-        
-        # Verificar si no ha expirado
-        if time.time() > user_data.get('expires', 0):
-            # Cookie expirada, limpiar
-            clear_user_cookies()
+        cookies = _request_cookies()
+
+        # Camino rápido: cookie firmada leída directamente de la petición
+        token = cookies.get(SESSION_COOKIE_NAME)
+        user_data = verify_session_token(token) if token else None
+
+        # Sesiones antiguas: solo se espera al gestor de cookies si esa cookie existe
+        if user_data is None and LEGACY_COOKIE_NAME in cookies:
+            user_data = _load_legacy_cookie()
+            if user_data and time.time() > user_data.get('expires', 0):
+                # Cookie expirada, limpiar
+                clear_user_cookies()
+                return None
+            if user_data:
+                user_data['legacy'] = True
+
+        if not user_data:
             return None
-        
+
         return {
             'email': user_data.get('email'),
             'picture': user_data.get('picture'),
-            'login_time': user_data.get('login_time')
+            'sid': user_data.get('sid'),
+            'login_time': user_data.get('login_time'),
+            'expires': user_data.get('expires'),
+            'legacy': user_data.get('legacy', False)
         }
-        
+
     except Exception as e:
         st.error(f"Error cargando cookies: {e}")
         return None
 
-def clear_user_cookies():
-    """Limpia las cookies del usuario (logout)"""
+def clear_user_cookies(redirect=None):
+    """Limpia las cookies del usuario (logout); con redirect recarga esa URL después de borrarlas"""
     try:
-        cookies = init_cookie_manager()
-        if cookies is None:
-            return False
-        
-        # Limpiar cookie
-        if 'user_data' in cookies:
-            del cookies['user_data']
-            cookies.save()
-        
+        st.session_state.pop("pending_session_cookie", None)
+
+        # Invalidar la sesión guardada en el servidor
+        if st.session_state.get("session_token"):
+            get_session_store().delete(st.session_state.pop("session_token"))
+
+        # Limpiar cookie antigua si sigue existiendo
+        if LEGACY_COOKIE_NAME in _request_cookies():
+            cookies = init_cookie_manager()
+            if cookies is not None and 'user_data' in cookies:
+                del cookies['user_data']
+                cookies.save()
+
+        _set_browser_cookie(SESSION_COOKIE_NAME, "", 0, redirect)
         return True
-        
+
     except Exception as e:
         st.error(f"Error limpiando cookies: {e}")
         return False
 
+def _migrate_legacy_session(email, picture_url=None):
+    """Crea la sesión del servidor de un usuario con la cookie antigua y le escribe la cookie firmada"""
+    try:
+        spreadsheet_id = get_user_spreadsheet_id(email)
+    except ValueError:
+        return  # Usuario no autorizado o inactivo: la app mostrará el error
+    start_server_session(email, spreadsheet_id, picture_url)
+    if save_user_to_cookies(email, picture_url):
+        flush_session_cookie()
+
 def check_auto_login():
     """Verifica si hay login automático disponible desde cookies"""
     try:
         user_data = load_user_from_cookies()
-        
+
         if user_data and user_data.get('email'):
+            # La cookie firmada solo vale mientras su sesión siga viva en el servidor
+            # (logout o borrado de la sesión la revocan); si no, se pide login de nuevo
+            session = get_session_store().get(user_data['sid']) if user_data.get('sid') else None
+            if not user_data.get('legacy') and (session is None or session['email'] != user_data['email']):
+                _set_browser_cookie(SESSION_COOKIE_NAME, "", 0)
+                return False
+
             # Auto-login exitoso
             st.session_state["user_email"] = user_data['email']
             if user_data.get('picture'):
                 st.session_state["user_picture"] = user_data['picture']
-            
+            st.session_state["session_expires"] = user_data.get('expires')
+
+            # Sesión guardada: trae la hoja de cálculo sin consultar el archivo maestro
+            if session and session['email'] == user_data['email']:
+                st.session_state["session_token"] = user_data['sid']
+                st.session_state["spreadsheet_id"] = session['spreadsheet_id']
+
+            # Migrar la sesión antigua a una sesión del servidor con su cookie firmada
+            if user_data.get('legacy'):
+                _migrate_legacy_session(user_data['email'], user_data.get('picture'))
+
             # Mostrar mensaje de bienvenida silencioso
             st.session_state["auto_logged_in"] = True
             return True
-        
+
         return False
-        
+
     except Exception as e:
         st.error(f"Error en auto-login: {e}")
         return False
 
 def extend_session():
-    """Extiende la sesión si el usuario está activo"""
+    """
+    Extiende la sesión si el usuario está activo.
+
+    Solo reescribe la cookie cuando le quedan menos de SESSION_RENEW_THRESHOLD_DAYS días y
+    no se ha renovado en los últimos SESSION_RENEW_MIN_INTERVAL segundos; en el resto de
+    reruns no hace ningún trabajo con cookies.
+    """
     try:
-        if "user_email" in st.session_state:
+        if "user_email" not in st.session_state:
+            return
+
+        now = time.time()
+        expires = st.session_state.get("session_expires")
+        recently_renewed = now - st.session_state.get("session_last_renewal", 0) < SESSION_RENEW_MIN_INTERVAL
+        far_from_expiry = expires is not None and expires - now > SESSION_RENEW_THRESHOLD_DAYS * 24 * 60 * 60
+
+        if not recently_renewed and not far_from_expiry:
             # Renovar cookie con nueva fecha de expiración
             save_user_to_cookies(
-                st.session_state["user_email"], 
+                st.session_state["user_email"],
                 st.session_state.get("user_picture")
             )
-        
+
+        flush_session_cookie()
+
     except Exception as e:
         pass  # Silencioso, no crítico
@@ -0,0 +1,84 @@
+import streamlit as st
+from pool_analysis import get_status_info
+
+# Plantillas HTML del Dashboard. Cada bloque (tarjetas + alertas, próximos mantenimientos) se
+# compone entero y se envía con un solo st.markdown, en lugar de un elemento por tarjeta dentro
+# de st.columns. Las clases están en static/pool_master.css.
+
+
+def dashboard_card_html(title, value, unit, status, icon):
+    """Tarjeta de un parámetro del dashboard"""
+    status_info = get_status_info(status)
+    return (
+        f'<div class="dashboard-card">'
+        f'<div class="card-header"><span class="card-icon">{icon}</span><h3 class="card-title">{title}</h3></div>'
+        f'<div class="big-number">{value} <span class="card-unit">{unit}</span></div>'
+        f'<div class="card-status"><div class="status-indicator {status_info["class"]}"></div>'
+        f'<span class="status-text {status_info["class"]}">{status_info["text"]}</span></div>'
+        f'</div>'
+    )
+
+def _alert_html(alert):
+    """Una alerta (alta o media prioridad) con los parámetros fuera de rango si es crítica"""
+    alta = alert.get('priority') == 'high'
+    html = (
+        f'<div class="alert-box {"alert-high" if alta else "alert-medium"}">'
+        f'<div class="alert-row"><span class="alert-icon">{"🚨" if alta else "⚠️"}</span><div>'
+        f'<strong class="alert-title">{alert["title"]}</strong>'
+        f'<div class="alert-message">{alert["message"]}</div>'
+        f'</div></div></div>'
+    )
+    if alta and alert.get('type') == 'critical' and alert.get('details'):
+        detalles = "".join(
+            f'<div class="alert-detail">'
+            f'<div class="alert-detail-icon">{detail["icon"]}</div>'
+            f'<div class="alert-detail-param">{detail["param"]}</div>'
+            f'<div class="alert-detail-value">{detail["value"]} {detail["unit"]}</div>'
+            f'<div class="alert-detail-status">{"ALTO" if detail["status"] == "high" else "BAJO"}</div>'
+            f'</div>'
+            for detail in alert['details']
+        )
+        html += f'<div class="dashboard-row">{detalles}</div>'
+    return html
+
+def alerts_html(alerts):
+    """Panel de alertas: primero las de alta prioridad y después las de prioridad media"""
+    if not alerts:
+        return ""
+    ordenadas = ([a for a in alerts if a.get('priority') == 'high'] +
+                 [a for a in alerts if a.get('priority') == 'medium'])
+    return '<h3>🚨 Alertas del Sistema</h3>' + "".join(_alert_html(a) for a in ordenadas) + '<hr>'
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def dashboard_status_html(cards, alerts):
+    """
+    Tarjetas de estado (tuplas title, value, unit, status, icon) y panel de alertas en un solo
+    bloque HTML (memoizado por sus valores: mientras no cambien las mediciones no se recompone).
+    """
+    tarjetas = "".join(dashboard_card_html(*card) for card in cards)
+    return f'<div class="dashboard-grid">{tarjetas}</div>' + alerts_html(alerts)
+
+def maintenance_urgency(days_until):
+    """Clase e icono de urgencia de un mantenimiento según los días que faltan"""
+    if days_until <= 2:
+        return "urgency-high", "🔴"
+    elif days_until <= 7:
+        return "urgency-medium", "🟠"
+    return "urgency-low", "🟢"
+
+def maintenance_card_html(tipo, fecha, days_until):
+    """Tarjeta de un mantenimiento programado (fecha ya formateada)"""
+    urgency, icon = maintenance_urgency(days_until)
+    return (
+        f'<div class="maint-card {urgency}">'
+        f'<div class="maint-icon">{icon}</div>'
+        f'<div class="maint-type">{tipo}</div>'
+        f'<div class="maint-date">{fecha}</div>'
+        f'<div class="maint-days">{days_until} día{"s" if days_until != 1 else ""}</div>'
+        f'</div>'
+    )
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def upcoming_maintenance_html(rows):
+    """Fila de tarjetas de próximos mantenimientos (tuplas tipo, fecha, días) en un solo bloque"""
+    return '<div class="dashboard-row">' + "".join(maintenance_card_html(*row) for row in rows) + '</div>'
@@ -0,0 +1,99 @@
+import random
+import re
+import time
+
+# Configuración por defecto del modelo simulado (se puede sobrescribir con [fake_llm] en secrets.toml)
+FAKE_LLM_DEFAULTS = {
+    'ttft_median': 0.8,     # Mediana de segundos hasta el primer fragmento
+    'ttft_sigma': 0.5,      # Dispersión (log-normal) del tiempo hasta el primer fragmento
+    'chunk_delay': 0.05,    # Segundos entre fragmentos
+    'chunk_words': 8,       # Palabras por fragmento
+    'error_rate': 0.0,      # Probabilidad de que la llamada falle (0-1)
+    'seed': None,           # Semilla para repetir la misma secuencia de latencias y errores
+}
+
+# Respuestas de plantilla por tipo de prompt
+FAKE_ANALYSIS_TEMPLATE = """🎯 **ESTADO ACTUAL**
+Respuesta simulada para pruebas sin conexión. Parámetros del contexto:
+{tendencias}
+
+📊 **ANÁLISIS DE TENDENCIAS**
+Sin cambios significativos respecto a las últimas mediciones.
+
+⚠️ **ALERTAS CRÍTICAS**
+Revisa los parámetros marcados como ALTO o BAJO.
+
+💡 **RECOMENDACIONES ESPECÍFICAS**
+1. Medir de nuevo mañana
+2. Mantener el clorador en su configuración actual
+3. Revisar el filtro
+4. Registrar cualquier cambio en las notas"""
+
+FAKE_QUESTION_TEMPLATE = """Respuesta simulada a tu pregunta: "{pregunta}".
+
+Según los datos actuales:
+{tendencias}
+
+Esta respuesta la genera el modelo local de pruebas, no Gemini."""
+
+
+class FakeChunk:
+    """Fragmento con la misma interfaz que los de Gemini (.text)"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeLLM:
+    """
+    Sustituto local de genai.GenerativeModel para pruebas de carga y trabajo sin conexión.
+
+    Responde con plantillas rellenadas con el prompt, con latencia log-normal configurable,
+    streaming por fragmentos y una tasa de errores inyectada.
+    """
+
+    def __init__(self, **settings):
+        config = {**FAKE_LLM_DEFAULTS, **settings}
+        self.ttft_median = float(config['ttft_median'])
+        self.ttft_sigma = float(config['ttft_sigma'])
+        self.chunk_delay = float(config['chunk_delay'])
+        self.chunk_words = max(int(config['chunk_words']), 1)
+        self.error_rate = float(config['error_rate'])
+        self.random = random.Random(config['seed'])
+        self.calls = 0
+
+    def _respond(self, prompt):
+        """Texto de respuesta según el tipo de prompt"""
+        pregunta = re.search(r'PREGUNTA: "(.*?)"', prompt, re.S)
+        tendencias = re.search(r"TENDENCIAS[^\n]*:\n(.*?)\n\n", prompt, re.S)
+        tendencias = tendencias.group(1).strip() if tendencias else "(sin datos de tendencias)"
+        if pregunta:
+            return FAKE_QUESTION_TEMPLATE.format(pregunta=pregunta.group(1), tendencias=tendencias)
+        return FAKE_ANALYSIS_TEMPLATE.format(tendencias=tendencias)
+
+    def _wait_first_chunk(self, timeout):
+        """Espera la latencia simulada y falla según error_rate o si supera el plazo"""
+        self.calls += 1
+        delay = self.ttft_median * self.random.lognormvariate(0, self.ttft_sigma)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"modelo simulado: plazo de {timeout}s agotado")
+        time.sleep(delay)
+        if self.random.random() < self.error_rate:
+            raise RuntimeError("modelo simulado: error 503 inyectado")
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        timeout = (request_options or {}).get('timeout')
+        if stream:
+            return self._stream(prompt, timeout)
+        self._wait_first_chunk(timeout)
+        return FakeChunk(self._respond(prompt))
+
+    def _stream(self, prompt, timeout):
+        self._wait_first_chunk(timeout)
+        palabras = self._respond(prompt).split(" ")
+        for i in range(0, len(palabras), self.chunk_words):
+            if i:
+                time.sleep(self.chunk_delay)
+            fin = " " if i + self.chunk_words < len(palabras) else ""
+            yield FakeChunk(" ".join(palabras[i:i + self.chunk_words]) + fin)
@@ -0,0 +1,99 @@
+import re
+import threading
+import time
+import requests
+import streamlit as st
+
+# Claves públicas de Google para firmar los ID tokens (JWKS)
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["https://accounts.google.com", "accounts.google.com"]
+
+# Tiempo que se conservan las claves si Google no indica Cache-Control (segundos)
+JWKS_DEFAULT_MAX_AGE = 6 * 60 * 60
+# Mínimo entre descargas forzadas por un 'kid' desconocido (rotación de claves)
+JWKS_MIN_REFRESH_SECONDS = 60
+# Tolerancia de reloj al comprobar exp/iat (segundos)
+ID_TOKEN_LEEWAY = 60
+
+
+
+class IDTokenError(Exception):
+    """El ID token no es válido (firma, emisor, audiencia o caducidad)"""
+
+
+def _fetch_google_jwks():
+    """Descarga el JWKS de Google; devuelve (jwks, segundos de validez según Cache-Control)"""
+    resp = requests.get(GOOGLE_JWKS_URL, timeout=5)
+    resp.raise_for_status()
+    match = re.search(r"max-age=(\d+)", resp.headers.get("Cache-Control", ""))
+    return resp.json(), int(match.group(1)) if match else JWKS_DEFAULT_MAX_AGE
+
+
+class JWKSCache:
+    """
+    Claves públicas en memoria indexadas por 'kid'.
+
+    Se renuevan al caducar o cuando llega un token firmado con una clave desconocida
+    (Google rota sus claves), como mucho una vez cada JWKS_MIN_REFRESH_SECONDS.
+    fetch() devuelve (jwks, max_age); en pruebas se le puede pasar un juego de claves local.
+    """
+
+    def __init__(self, fetch=_fetch_google_jwks):
+        self.fetch = fetch
+        self.lock = threading.Lock()
+        self.keys = {}
+        self.expires_at = 0
+        self.last_fetch = 0
+
+    def _refresh(self):
+        from authlib.jose import JsonWebKey
+
+        jwks, max_age = self.fetch()
+        self.keys = {jwk["kid"]: JsonWebKey.import_key(jwk) for jwk in jwks.get("keys", []) if "kid" in jwk}
+        self.last_fetch = time.monotonic()
+        self.expires_at = self.last_fetch + max_age
+
+    def get_key(self, kid):
+        """Clave pública con ese 'kid' (descargando el JWKS si hace falta)"""
+        with self.lock:
+            now = time.monotonic()
+            if now >= self.expires_at:
+                self._refresh()
+            elif kid not in self.keys and now - self.last_fetch >= JWKS_MIN_REFRESH_SECONDS:
+                self._refresh()
+
+            key = self.keys.get(kid)
+            if key is None:
+                raise IDTokenError(f"Clave de firma desconocida: {kid}")
+            return key
+
+
+@st.cache_resource
+def get_google_jwks():
+    """Caché de claves de Google compartida por todo el proceso"""
+    return JWKSCache()
+
+def verify_id_token(id_token, audience, jwks=None, issuers=GOOGLE_ISSUERS):
+    """
+    Verifica localmente un ID token de Google (firma RS256, emisor, audiencia y caducidad)
+    y devuelve sus claims (email, email_verified, picture, ...).
+    """
+    # authlib solo hace falta al hacer login, no en cada ejecución del script
+    from authlib.jose import JsonWebToken
+    from authlib.jose.errors import JoseError
+
+    jwks = jwks or get_google_jwks()
+    try:
+        claims = JsonWebToken(["RS256"]).decode(
+            id_token,
+            key=lambda header, payload: jwks.get_key(header.get("kid")),
+            claims_options={
+                "iss": {"essential": True, "values": issuers},
+                "aud": {"essential": True, "value": audience},
+                "exp": {"essential": True},
+            },
+        )
+        claims.validate(leeway=ID_TOKEN_LEEWAY)
+    except JoseError as e:
+        raise IDTokenError(str(e)) from e
+    return dict(claims)
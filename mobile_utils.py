@@ -1,6 +1,9 @@
+import re
 import streamlit as st
 import streamlit.components.v1 as components
 
+MOBILE_UA_PATTERN = re.compile(r'Android|webOS|iPhone|iPad|iPod|BlackBerry|IEMobile|Opera Mini|Mobile', re.I)
+
 def detect_mobile_device():
     """Detecta si es un dispositivo móvil usando JavaScript"""
     
@@ -68,6 +71,15 @@ def is_mobile():
     
     return st.session_state.get('is_mobile', False)
 
+def get_device_class():
+    """Devuelve 'mobile' o 'desktop' según el User-Agent de la petición"""
+    try:
+        user_agent = st.context.headers.get('User-Agent', '') or ''
+    except Exception:
+        # Versiones de Streamlit sin st.context
+        user_agent = st.session_state.get('user_agent', '')
+    return 'mobile' if MOBILE_UA_PATTERN.search(user_agent) else 'desktop'
+
 def is_ios():
     """Detecta específicamente si es iOS"""
     user_agent = st.session_state.get('user_agent', '').lower()
@@ -0,0 +1,281 @@
+from datetime import date
+import pandas as pd
+import streamlit as st
+from chart_utils import (get_rollups, choose_bucket, downsample_frame, get_figure_cache, use_webgl,
+                         encode_dates, encode_values, CHART_DECIMALS,
+                         ROLLUP_BUCKETS, DOWNSAMPLE_TARGET_POINTS, MOBILE_DOWNSAMPLE_TARGET_POINTS,
+                         MAX_CHART_POINTS, HIGH_PERFORMANCE_TARGET_POINTS)
+from mobile_utils import get_device_class
+from pool_analysis import RANGES
+from sheets_data import get_data_version
+
+
+def create_enhanced_chart(df, param_seleccionado, max_points=DOWNSAMPLE_TARGET_POINTS, high_performance=False):
+    """Crea gráficos mejorados con tema oscuro"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    
+    # Submuestreo LTTB: tamaño acotado sin perder los valores fuera de rango
+    if high_performance:
+        max_points = max(max_points, HIGH_PERFORMANCE_TARGET_POINTS)
+    rango = RANGES.get(param_seleccionado, {})
+    df = downsample_frame(df, 'Fecha_Completa', param_seleccionado, max_points, rango.get('min'), rango.get('max'))
+    
+    # Series largas con WebGL; los rangos óptimos siguen siendo shapes (hline/hrect)
+    webgl = use_webgl(len(df), high_performance)
+    scatter = go.Scattergl if webgl else go.Scatter
+    
+    # Payload compacto: fechas en milisegundos epoch y valores con la precisión de la medición
+    decimals = CHART_DECIMALS.get(param_seleccionado, 2)
+    x = encode_dates(df['Fecha_Completa'])
+    
+    # Colores del gradiente
+    colors = ['#667eea', '#764ba2', '#f093fb', '#f5576c']
+    
+    fig.add_trace(scatter(
+        x=x,
+        y=encode_values(df[param_seleccionado], decimals),
+        mode='lines+markers',
+        name=param_seleccionado,
+        line=dict(width=2 if webgl else 4, color=colors[0]),
+        marker=dict(size=4, color=colors[1]) if webgl else dict(size=10, color=colors[1], 
+                   line=dict(width=2, color='white')),
+        fill='tonexty',
+        fillcolor='rgba(102, 126, 234, 0.1)'
+    ))
+    
+    # Datos agrupados: banda mínimo-máximo de cada periodo
+    if f'{param_seleccionado}_min' in df.columns:
+        fig.add_trace(scatter(
+            x=x,
+            y=encode_values(df[f'{param_seleccionado}_max'], decimals),
+            mode='lines',
+            name='Máximo',
+            line=dict(width=0),
+            showlegend=False
+        ))
+        fig.add_trace(scatter(
+            x=x,
+            y=encode_values(df[f'{param_seleccionado}_min'], decimals),
+            mode='lines',
+            name='Mínimo',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor='rgba(118, 75, 162, 0.15)',
+            showlegend=False
+        ))
+    
+    # Añadir líneas de rango óptimo
+    if param_seleccionado in RANGES:
+        min_val = RANGES[param_seleccionado]['min']
+        max_val = RANGES[param_seleccionado]['max']
+        
+        fig.add_hline(y=min_val, line_dash="dash", line_color="#ffa500", 
+                     line_width=3, annotation_text=f"Mínimo: {min_val}")
+        fig.add_hline(y=max_val, line_dash="dash", line_color="#ffa500", 
+                     line_width=3, annotation_text=f"Máximo: {max_val}")
+        
+        # Área de rango óptimo
+        fig.add_hrect(y0=min_val, y1=max_val, 
+                     fillcolor="rgba(0, 255, 0, 0.1)", 
+                     layer="below", line_width=0)
+    
+    # Tema oscuro para el gráfico
+    fig.update_layout(
+        title=f"📈 Evolución de {param_seleccionado}",
+        title_font_size=20,
+        title_font_color="#212529",
+        xaxis_title="Fecha y Hora",
+        yaxis_title=f"{param_seleccionado} ({RANGES.get(param_seleccionado, {}).get('unit', '')})",
+        height=500,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font_color="#212529",
+        xaxis=dict(
+            type='date',
+            gridcolor='rgba(255,255,255,0.2)',
+            showgrid=True
+        ),
+        yaxis=dict(
+            gridcolor='rgba(255,255,255,0.2)',
+            showgrid=True,
+            hoverformat=f'.{decimals}f',
+            range=get_chart_range(param_seleccionado)
+        )
+    )
+    
+    return fig
+
+def create_multi_param_chart(df, params_multi, max_points=DOWNSAMPLE_TARGET_POINTS, high_performance=False):
+    """Crea la comparativa normalizada de varios parámetros"""
+    import plotly.graph_objects as go
+
+    if high_performance:
+        max_points = max(max_points, HIGH_PERFORMANCE_TARGET_POINTS)
+
+    # Rangos ampliados para visualización (más margen que los rangos óptimos)
+    visualization_ranges = {
+        'pH': {'min': 6.5, 'max': 8.0},           # Óptimo: 7.2-7.6
+        'Sal': {'min': 2000, 'max': 5000},        # Óptimo: 2700-4500  
+        'Conductividad': {'min': 3000, 'max': 7000}, # Óptimo: 3000-6000
+        'TDS': {'min': 1500, 'max': 5000},        # Óptimo: 1500-3000
+        'ORP': {'min': 500, 'max': 900},          # Óptimo: 650-750 (mucho más margen)
+        'FAC': {'min': 0, 'max': 5},              # Óptimo: 1.0-3.0
+        'Temperatura': {'min': 20, 'max': 35}
+    }
+    
+    fig_multi = go.Figure()
+    colors = ['#667eea', '#764ba2', '#f093fb', '#f5576c', '#4facfe', '#00f2fe']
+    
+    for i, param in enumerate(params_multi):
+        # Submuestreo por traza conservando los valores fuera de rango óptimo
+        rango = RANGES.get(param, {})
+        df_param = downsample_frame(df, 'Fecha_Completa', param, max_points, rango.get('min'), rango.get('max'))
+        
+        # Normalizar datos con rangos ampliados para mejor visualización
+        if param in visualization_ranges:
+            min_val = visualization_ranges[param]['min']
+            max_val = visualization_ranges[param]['max']
+            y_norm = ((df_param[param] - min_val) / (max_val - min_val)) * 100
+        else:
+            # Si no tiene rango de visualización, usar valores reales
+            y_norm = df_param[param]
+        
+        webgl = use_webgl(len(df_param), high_performance)
+        scatter = go.Scattergl if webgl else go.Scatter
+        
+        fig_multi.add_trace(scatter(
+            x=encode_dates(df_param['Fecha_Completa']),
+            y=encode_values(y_norm, 1),
+            mode='lines+markers',
+            name=f'{param} (% del rango)',
+            line=dict(width=2 if webgl else 3, color=colors[i % len(colors)]),
+            marker=dict(size=4 if webgl else 8)
+        ))
+    
+    # Líneas de referencia basadas en rangos óptimos, no de visualización
+    fig_multi.add_hline(y=100, line_dash="dash", line_color="orange", 
+                       annotation_text="Límite superior visualización")
+    fig_multi.add_hline(y=0, line_dash="dash", line_color="orange", 
+                       annotation_text="Límite inferior visualización")
+
+    # Añadir zona óptima (50% aproximadamente para la mayoría)
+    fig_multi.add_hrect(y0=25, y1=75, fillcolor="rgba(0, 255, 0, 0.1)", 
+                       layer="below", line_width=0, 
+                       annotation_text="Zona típicamente óptima")
+
+    fig_multi.update_layout(
+        title="📊 Comparativa Normalizada de Parámetros",
+        title_font_color="white",
+        xaxis_title="Fecha y Hora",
+        yaxis_title="Porcentaje del Rango Óptimo (%)",
+        height=400,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font_color="white",
+        xaxis=dict(type='date', gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(gridcolor='rgba(255,255,255,0.2)', hoverformat='.1f')
+    )
+    
+    return fig_multi
+
+def get_chart_range(param):
+    """Define rangos personalizados para cada parámetro en los gráficos"""
+    ranges = {
+        'pH': [6.5, 8.5],
+        'Sal': [2000, 4500],
+        'Conductividad': [2000, 8000],
+        'TDS': [1000, 4500],
+        'ORP': [500, 800],
+        'FAC': [0, 3],
+        'Temperatura': [20, 35]
+    }
+    return ranges.get(param, None)
+
+
+def render(services):
+    """📈 Gráficos: evolución de un parámetro y comparativa de varios"""
+    st.markdown("### 📈 Análisis de Tendencias")
+
+    df = services.measurements()
+
+    if df.empty:
+        st.info("📊 No hay datos para mostrar. Añade algunas mediciones primero.")
+        return
+
+    # Preparar datos
+    data_version = get_data_version(df)
+    # Columna nueva sobre una copia: df es la copia local compartida de la sesión (SheetState)
+    df = df.assign(Fecha_Completa=pd.to_datetime(df['Dia'].dt.strftime('%Y-%m-%d') + ' ' + df['Hora'].astype(str)))
+    df_full = df
+    df = df.sort_values('Fecha_Completa')
+
+    # Selector de parámetros mejorado
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        parametros = ['pH', 'Conductividad', 'TDS', 'Sal', 'ORP', 'FAC','Temperatura']
+        param_seleccionado = st.selectbox("📊 Selecciona parámetro:", parametros)
+
+    with col2:
+        periodo = st.selectbox("📅 Período:", ["Todos", "Última semana", "Último mes", "Último año"])
+
+    with col3:
+        agrupacion = st.selectbox("🗓️ Agrupación:", ["Automática", "Sin agrupar"] + list(ROLLUP_BUCKETS))
+
+    alto_rendimiento = st.toggle(
+        "⚡ Gráfico de alto rendimiento",
+        help="Dibuja con WebGL y muestra muchos más puntos. Recomendado para historiales largos."
+    )
+
+    # Filtrar por período
+    dias_periodo = {"Última semana": 7, "Último mes": 30, "Último año": 365}
+    if periodo in dias_periodo:
+        fecha_limite = pd.Timestamp.now() - pd.Timedelta(days=dias_periodo[periodo])
+        df = df[df['Fecha_Completa'] >= fecha_limite]
+    else:
+        fecha_limite = None
+
+    if df.empty:
+        st.info("📊 No hay mediciones en el período seleccionado.")
+        return
+
+    # Elegir agrupación: la más fina que no satura el gráfico
+    if agrupacion == "Automática":
+        span_days = (df['Fecha_Completa'].max() - df['Fecha_Completa'].min()).days
+        bucket = choose_bucket(len(df), span_days, HIGH_PERFORMANCE_TARGET_POINTS if alto_rendimiento else MAX_CHART_POINTS)
+    elif agrupacion == "Sin agrupar":
+        bucket = None
+    else:
+        bucket = agrupacion
+
+    if bucket:
+        # Agregados precalculados (incrementales y cacheados por hoja)
+        df = get_rollups(services.spreadsheet_id, df_full)[bucket]
+        if fecha_limite is not None:
+            df = df[df['Fecha_Completa'] >= fecha_limite.to_period(ROLLUP_BUCKETS[bucket]).start_time]
+        st.caption(f"🗓️ Mostrando medias por agrupación **{bucket.lower()}** con banda mínimo-máximo")
+
+    # Caché de figuras: (hoja, versión de datos, parámetros, período, dispositivo)
+    figure_cache = get_figure_cache()
+    device_class = get_device_class()
+    max_points = MOBILE_DOWNSAMPLE_TARGET_POINTS if device_class == "mobile" else DOWNSAMPLE_TARGET_POINTS
+    periodo_key = (periodo, date.today().isoformat(), bucket, alto_rendimiento)
+
+    # Gráfico principal mejorado
+    fig = figure_cache.get_or_build(
+        ("evolucion", services.spreadsheet_id, data_version, (param_seleccionado,), periodo_key, device_class),
+        lambda: create_enhanced_chart(df, param_seleccionado, max_points, alto_rendimiento)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Gráfico de comparativa múltiple
+    st.markdown("### 📊 Comparativa Multi-Parámetro")
+    params_multi = st.multiselect("Selecciona parámetros:", parametros, default=['pH', 'ORP'])
+
+    if params_multi:
+        fig_multi = figure_cache.get_or_build(
+            ("comparativa", services.spreadsheet_id, data_version, tuple(params_multi), periodo_key, device_class),
+            lambda: create_multi_param_chart(df, params_multi, max_points, alto_rendimiento)
+        )
+        st.plotly_chart(fig_multi, use_container_width=True)
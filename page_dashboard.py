@@ -0,0 +1,335 @@
+import logging
+from time import perf_counter
+import pandas as pd
+import streamlit as st
+from ai_cache import stream_with_cache, stream_with_semantic_cache
+from ai_client import GEMINI_MODEL, get_llm_client, stream_with_fallback
+from ai_context import (build_ai_context, ai_data_version, add_relevant_records, log_prompt_size,
+                        build_analysis_prompt, build_question_prompt)
+from ai_jobs import get_ai_job_runner
+from ai_retrieval import retrieve_relevant_records
+from dashboard_html import dashboard_status_html, upcoming_maintenance_html
+from pool_analysis import (RANGES, check_parameter_status, analyze_alerts, data_state_fingerprint,
+                           rule_based_analysis)
+from sheets_data import get_pool_info
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# 🤖 ANÁLISIS CON IA - GOOGLE GEMINI
+# ============================================================================
+
+def configurar_gemini():
+    """Cliente de IA compartido por el proceso (plazos, límite de concurrencia y cortacircuitos)"""
+    try:
+        return get_llm_client()
+    except Exception as e:
+        st.error(f"Error configurando Gemini: {e}")
+        return None
+
+def ia_no_disponible(df, maint_df=None):
+    """Análisis basado en reglas para cuando no se puede usar la IA"""
+    return "⚠️ IA no disponible. Análisis automático basado en reglas:\n\n" + rule_based_analysis(df, maint_df)
+
+def get_ai_context(df, maint_df, info_sheet):
+    """Contexto de la IA reutilizando las mediciones y el mantenimiento ya cargados"""
+    pool_info = get_pool_info(info_sheet)
+    return build_ai_context(df, maint_df, pool_info, ai_data_version(df, maint_df, pool_info))
+
+def get_question_context(spreadsheet_id, df, maint_df, info_sheet, pregunta_usuario):
+    """Contexto de la IA más los registros del historial completo relacionados con la pregunta"""
+    contexto = get_ai_context(df, maint_df, info_sheet)
+    relevantes = retrieve_relevant_records(spreadsheet_id, df, maint_df, pregunta_usuario, notas=contexto['notas'])
+    contexto = add_relevant_records(contexto, relevantes)
+    contexto['spreadsheet_id'] = spreadsheet_id  # la caché semántica no comparte respuestas entre usuarios
+    return contexto
+
+def analizar_tendencias_piscina(df, contexto, stream=False, metrics=None, maint_df=None):
+    """Analiza tendencias de la piscina usando Google Gemini con contexto completo (stream=True devuelve fragmentos)"""
+    
+    if df.empty:
+        return "📊 No hay datos suficientes para análizar"
+    
+    # Configurar Gemini
+    model = configurar_gemini()
+    if model is None:
+        return ia_no_disponible(df, maint_df)
+    
+    try:
+        prompt = build_analysis_prompt(contexto)
+        log_prompt_size("analisis", prompt, metrics)
+        if metrics is not None:
+            metrics['model'] = model.model_name
+        
+        # Generar análisis (o reutilizar uno idéntico de la caché); si Gemini no responde a tiempo, reglas
+        respuesta = stream_with_fallback(
+            stream_with_cache(model, model.model_name, prompt, metrics),
+            lambda: rule_based_analysis(df, maint_df), metrics
+        )
+        return respuesta if stream else "".join(respuesta)
+        
+    except Exception as e:
+        return f"❌ Error en el análisis: {str(e)}"
+
+def consultar_ia_personalizada(df, contexto, pregunta_usuario="", stream=False, metrics=None, maint_df=None):
+    """Responde preguntas específicas del usuario usando contexto completo (mismo que análisis automático)"""
+    
+    if df.empty:
+        return "📊 No hay datos suficientes para responder tu consulta"
+    
+    if not pregunta_usuario.strip():
+        return "❓ No has hecho ninguna pregunta"
+    
+    # Configurar Gemini
+    model = configurar_gemini()
+    if model is None:
+        return ia_no_disponible(df, maint_df)
+    
+    try:
+        prompt = build_question_prompt(contexto, pregunta_usuario)
+        log_prompt_size("pregunta", prompt, metrics)
+        if metrics is not None:
+            metrics['model'] = model.model_name
+        
+        # Generar respuesta (o reutilizar la de una pregunta parecida con el mismo estado de datos)
+        respuesta = stream_with_fallback(
+            stream_with_semantic_cache(model, model.model_name, prompt, pregunta_usuario,
+                                       contexto['spreadsheet_id'], data_state_fingerprint(df), metrics),
+            lambda: rule_based_analysis(df, maint_df), metrics
+        )
+        return respuesta if stream else "".join(respuesta)
+        
+    except Exception as e:
+        return f"❌ Error respondiendo la consulta: {str(e)}"
+
+def ai_response_html(texto, estilo, encabezado=""):
+    """Caja con degradado para mostrar una respuesta de la IA (estilo: clase ai-analysis o ai-question)"""
+    return f"""
+    <div class="ai-response {estilo}">
+        <div class="ai-response-text">
+            {encabezado}{texto.replace(chr(10), '<br>')}
+        </div>
+    </div>
+    """
+
+# Estilo de cada tipo de análisis en segundo plano: (título, clase del degradado, prefijo de error)
+AI_JOB_STYLES = {
+    "analisis": ("📋 Análisis de Tendencias", "ai-analysis", "❌ Error en el análisis"),
+    "pregunta": ("💬 Respuesta Personalizada", "ai-question", "❌ Error respondiendo la consulta"),
+}
+# Cada cuántos segundos se refrescan los análisis en curso
+AI_JOB_POLL_SECONDS = 1.0
+# Análisis de la sesión que se muestran en el Dashboard
+AI_JOBS_SHOWN = 3
+
+def lanzar_analisis_ia(tipo, df, contexto, pregunta_usuario="", maint_df=None):
+    """Envía el análisis (o la pregunta) al pool de IA sin bloquear la ejecución del script"""
+    metrics = {}
+    if tipo == "pregunta":
+        respuesta = consultar_ia_personalizada(df, contexto, pregunta_usuario, stream=True, metrics=metrics, maint_df=maint_df)
+    else:
+        respuesta = analizar_tendencias_piscina(df, contexto, stream=True, metrics=metrics, maint_df=maint_df)
+    
+    # Las respuestas de error llegan como texto completo
+    if isinstance(respuesta, str):
+        respuesta = [respuesta]
+    
+    job = get_ai_job_runner().submit(
+        st.session_state.get("user_email", ""), respuesta, metrics, tipo=tipo, pregunta=pregunta_usuario
+    )
+    if job is None:
+        st.warning("⏳ Ya tienes análisis en cola. Espera a que terminen antes de lanzar otro.")
+        return
+    st.session_state.setdefault("ai_jobs", []).insert(0, job.id)
+
+def _render_ai_jobs(job_ids, polling=False):
+    """Pinta los análisis de la sesión; mientras alguno esté en curso el fragmento se refresca solo"""
+    runner = get_ai_job_runner()
+    jobs = [job for job in (runner.get(job_id) for job_id in job_ids) if job is not None]
+    
+    for job in jobs:
+        titulo, estilo, error_prefix = AI_JOB_STYLES.get(job.info.get("tipo"), AI_JOB_STYLES["analisis"])
+        encabezado = ""
+        if job.info.get("tipo") == "pregunta":
+            encabezado = f"<strong>Tu pregunta:</strong> {job.info.get('pregunta', '')}<br><br><strong>Respuesta:</strong><br>"
+        
+        texto = job.text
+        if job.status == "error":
+            texto += f"\n\n{error_prefix}: {job.error}"
+        elif not texto:
+            texto = "🤖 Pensando..." if job.status == "en_curso" else "⏳ En cola..."
+        
+        st.markdown(f"#### {titulo}")
+        st.markdown(ai_response_html(texto, estilo, encabezado), unsafe_allow_html=True)
+        
+        # Tiempo hasta el primer fragmento (latencia percibida) y total
+        if job.done and 'ttft' in job.metrics:
+            origen = "caché" if job.metrics.get('cached') else job.metrics.get('model', GEMINI_MODEL)
+            if job.metrics.get('fallback'):
+                origen = "reglas (IA no disponible)"
+            elif 'semantic' in job.metrics:
+                origen = f"pregunta similar en caché ({job.metrics['semantic']:.0%})"
+            if 'hit_rate' in job.metrics:
+                origen += f" · aciertos de caché {job.metrics['hit_rate']:.0%}"
+            tokens = f" · ~{job.metrics['prompt_tokens']} tokens de prompt" if 'prompt_tokens' in job.metrics else ""
+            st.caption(f"⏱️ Primer fragmento en {job.metrics['ttft']:.2f}s · total {job.metrics.get('total', 0):.1f}s · {origen}{tokens}")
+    
+    # Cuando todo ha terminado se relanza el script para dejar de sondear
+    if polling and all(job.done for job in jobs):
+        st.rerun()
+
+def show_ai_jobs():
+    """Muestra los últimos análisis de IA de la sesión (sondeando solo si hay alguno pendiente)"""
+    runner = get_ai_job_runner()
+    job_ids = [job_id for job_id in st.session_state.get("ai_jobs", []) if runner.get(job_id) is not None]
+    st.session_state["ai_jobs"] = job_ids
+    job_ids = job_ids[:AI_JOBS_SHOWN]
+    if not job_ids:
+        return
+    
+    pendiente = any(not runner.get(job_id).done for job_id in job_ids)
+    fragmento = st.fragment(_render_ai_jobs, run_every=AI_JOB_POLL_SECONDS if pendiente else None)
+    fragmento(job_ids, polling=pendiente)
+
+def render(services):
+    """🏠 Dashboard: estado actual, alertas, análisis con IA y próximos mantenimientos"""
+    # Obtener datos más recientes
+    df = services.measurements()
+
+    if df.empty:
+        st.info("📊 No hay datos disponibles. Añade tu primera medición.")
+        return
+
+    # Mantenimiento: se carga una vez y se reutiliza en alertas, IA y próximos mantenimientos
+    maintenance_df = services.maintenance()
+
+    # Analizar alertas
+    alerts = analyze_alerts(df, maintenance_df)
+
+    # Datos más recientes
+    latest_data = df.iloc[-1]
+
+    st.markdown("### 📊 Estado Actual de la Piscina")
+
+    # Tarjetas y alertas en un solo bloque HTML (memoizado por los valores de la última medición)
+    params = ['pH', 'Sal', 'FAC', 'ORP', 'Conductividad', 'TDS','Temperatura']
+    cards = tuple(
+        (param, latest_data[param], RANGES.get(param, {}).get('unit', ''),
+         check_parameter_status(latest_data[param], param), RANGES.get(param, {}).get('icon', '📊'))
+        for param in params if param in latest_data
+    )
+    st.markdown(dashboard_status_html(cards, alerts), unsafe_allow_html=True)
+
+    # Mostrar alertas debajo del estado actual
+    if not alerts:
+        st.success("✅ No hay alertas. ¡Tu piscina está en perfecto estado!")
+
+    # ============================================================================
+    # 🤖 ANÁLISIS INTELIGENTE CON IA
+    # ============================================================================
+    st.markdown("---")
+    st.markdown("### 🤖 Análisis Inteligente")
+
+    # Campo para preguntas específicas
+    st.markdown("#### 💬 Consulta Personalizada (Opcional)")
+    pregunta_usuario = st.text_area(
+        "Haz una pregunta específica a la IA:",
+        placeholder="Ej: ¿Por qué el pH está bajando? ¿Cuándo debo cambiar el filtro? ¿El cloro está bien para esta época?",
+        height=80,
+        help="Deja vacío para análisis automático, o escribe una pregunta específica"
+    )
+
+    # Botones de análisis
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        # Dos botones diferentes según si hay pregunta o no
+        if pregunta_usuario.strip():
+            col_a, col_b = st.columns(2)
+
+            with col_a:
+                if st.button("🔍 Análisis Automático", use_container_width=True):
+                    lanzar_analisis_ia("analisis", df, get_ai_context(df, maintenance_df, services.info_sheet), maint_df=maintenance_df)
+
+            with col_b:
+                if st.button("💬 Responder Pregunta", type="primary", use_container_width=True):
+                    lanzar_analisis_ia(
+                        "pregunta", df, get_question_context(services.spreadsheet_id, df, maintenance_df, services.info_sheet, pregunta_usuario), pregunta_usuario,
+                        maint_df=maintenance_df
+                    )
+        else:
+            # Solo botón de análisis automático si no hay pregunta
+            if st.button("🔍 Analizar Tendencias con IA", type="primary", use_container_width=True):
+                lanzar_analisis_ia("analisis", df, get_ai_context(df, maintenance_df, services.info_sheet), maint_df=maintenance_df)
+                st.info("💡 **Tip:** Escribe una pregunta específica arriba para consultas personalizadas")
+
+    # Los análisis siguen ejecutándose en segundo plano aunque se navegue a otra pestaña
+    show_ai_jobs()
+
+    st.markdown("---")
+
+
+    # Resumen general
+    st.markdown("### 🎯 Resumen del Estado")
+
+    params_status = {}
+    for param in params:
+        if param in latest_data:
+            status = check_parameter_status(latest_data[param], param)
+            params_status[status] = params_status.get(status, 0) + 1
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        optimal_count = params_status.get('optimal', 0)
+        st.metric("✅ Parámetros Óptimos", optimal_count, f"de {len(params)}")
+
+    with col2:
+        warning_count = params_status.get('low', 0) + params_status.get('high', 0)
+        st.metric("⚠️ Requieren Atención", warning_count)
+
+    with col3:
+        last_date = latest_data['Dia'].strftime('%d/%m/%Y')
+        st.metric("📅 Última Medición", last_date)
+
+    with col4:
+        days_since = (pd.Timestamp.now().date() - latest_data['Dia'].date()).days
+        st.metric("⏰ Días Transcurridos", days_since)
+
+    # Próximos mantenimientos en el dashboard
+    st.markdown("### 📅 Próximos Mantenimientos")
+
+    try:
+        if not maintenance_df.empty and 'Proximo_Mantenimiento' in maintenance_df.columns:
+            # Filtrar solo mantenimientos futuros
+            future_maintenance = maintenance_df[
+                (maintenance_df['Proximo_Mantenimiento'].notna()) & 
+                (maintenance_df['Proximo_Mantenimiento'] > pd.Timestamp.now())
+            ].copy()
+
+            if not future_maintenance.empty:
+                # Obtener los 3 próximos
+                next_maintenance = future_maintenance.nsmallest(3, 'Proximo_Mantenimiento')
+
+                hoy = pd.Timestamp.now().date()
+                rows = tuple(
+                    (row['Tipo'], row['Proximo_Mantenimiento'].strftime('%d/%m/%Y'),
+                     (row['Proximo_Mantenimiento'].date() - hoy).days)
+                    for _, row in next_maintenance.iterrows()
+                )
+                st.markdown(upcoming_maintenance_html(rows), unsafe_allow_html=True)
+            else:
+                st.info("📅 No hay mantenimientos programados próximamente.")
+        else:
+            st.info("📅 No hay datos de mantenimiento programado.")
+
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+
+    # ⏱️ Tiempo desde que se abrió la sesión hasta el primer Dashboard completo
+    if "time_to_dashboard" not in st.session_state:
+        st.session_state["time_to_dashboard"] = perf_counter() - st.session_state["session_started_at"]
+        logger.info(
+            "Dashboard listo en %.2fs (%d ejecuciones del script)",
+            st.session_state["time_to_dashboard"], st.session_state["session_runs"]
+        )
@@ -0,0 +1,83 @@
+import pandas as pd
+import streamlit as st
+from chart_utils import get_rollups, ROLLUP_BUCKETS
+
+
+def render(services):
+    """📋 Historial de mediciones con filtros, descarga y resumen por periodo"""
+    st.markdown("### 📋 Historial Completo de Mediciones")
+
+    df = services.measurements()
+
+    if df.empty:
+        st.info("📊 No hay datos para mostrar.")
+        return
+
+    # Estadísticas mejoradas
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("📊 Total Mediciones", len(df))
+    with col2:
+        if not df.empty:
+            last_date = df['Dia'].max().strftime('%d/%m/%Y')
+            st.metric("📅 Última Medición", last_date)
+    with col3:
+        days_range = (df['Dia'].max() - df['Dia'].min()).days if len(df) > 1 else 0
+        st.metric("📈 Días de Seguimiento", days_range)
+    with col4:
+        avg_per_week = round(len(df) / max(days_range/7, 1), 1) if days_range > 0 else len(df)
+        st.metric("⏱️ Mediciones/Semana", avg_per_week)
+
+    # Filtros mejorados
+    st.markdown("### 🔍 Filtros")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if not df.empty:
+            fecha_inicio = st.date_input("Desde:", value=df['Dia'].min())
+    with col2:
+        if not df.empty:
+            fecha_fin = st.date_input("Hasta:", value=df['Dia'].max())
+    with col3:
+        mostrar_filas = st.selectbox("Mostrar:", [10, 25, 50, 100, "Todas"])
+
+    # Filtrar y mostrar datos
+    if not df.empty:
+        mask = (df['Dia'] >= pd.Timestamp(fecha_inicio)) & (df['Dia'] <= pd.Timestamp(fecha_fin))
+        df_filtered = df[mask]
+
+        if mostrar_filas != "Todas":
+            df_filtered = df_filtered.tail(mostrar_filas)
+
+        # Formatear para mostrar
+        df_display = df_filtered.copy()
+        df_display['Dia'] = df_display['Dia'].dt.strftime('%d/%m/%Y')
+        df_display['Hora'] = df_display['Hora'].astype(str)
+
+        st.dataframe(df_display, use_container_width=True, height=400)
+
+        # Botón de descarga mejorado
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            csv = df_filtered.to_csv(index=False)
+            st.download_button(
+                label="📥 Descargar Datos en CSV",
+                data=csv,
+                file_name=f"piscina_datos_{fecha_inicio}_{fecha_fin}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+
+        # Resumen agregado por periodo (precalculado e incremental)
+        with st.expander("📊 Resumen por periodo (mínimo / media / máximo)"):
+            bucket_hist = st.selectbox("Agrupación:", list(ROLLUP_BUCKETS), index=1, key="hist_bucket")
+            df_rollup = get_rollups(services.spreadsheet_id, df)[bucket_hist]
+            inicio_bucket = pd.Timestamp(fecha_inicio).to_period(ROLLUP_BUCKETS[bucket_hist]).start_time
+            df_rollup = df_rollup[
+                (df_rollup['Fecha_Completa'] >= inicio_bucket) & 
+                (df_rollup['Fecha_Completa'] <= pd.Timestamp(fecha_fin))
+            ].copy()
+            df_rollup['Fecha_Completa'] = df_rollup['Fecha_Completa'].dt.strftime('%d/%m/%Y')
+            df_rollup = df_rollup.rename(columns={'Fecha_Completa': 'Desde'})
+            st.dataframe(df_rollup, use_container_width=True, hide_index=True)
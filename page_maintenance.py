@@ -0,0 +1,335 @@
+from datetime import date
+import pandas as pd
+import streamlit as st
+from app_services import request_sheet_sync, start_sheet_sync
+from dashboard_html import maintenance_card_html
+
+
+def _set_confirm_delete(delete_key, value):
+    """Activa o cancela la confirmación de borrado de un recordatorio (callback de los botones)"""
+    st.session_state.confirm_delete[delete_key] = value
+
+def _delete_reminder(services, tipo_mantenimiento, fecha_programada, delete_key):
+    """
+    Borra un recordatorio confirmado. Al ser un callback se ejecuta antes de repintar el
+    fragmento, así que la lista ya sale actualizada; como aquí st.rerun() no hace nada, el
+    aviso y el seguimiento de la escritura quedan para _after_delete.
+    """
+    st.session_state.confirm_delete[delete_key] = False
+    if services.clear_maintenance_alert_by_data(tipo_mantenimiento, fecha_programada):
+        st.session_state.reminder_notice = f"✅ Recordatorio '{tipo_mantenimiento}' eliminado"
+        request_sheet_sync()
+    else:
+        st.session_state.reminder_notice = "❌ Error al eliminar"
+
+def _after_delete(services):
+    """Al pintar un fragmento tras un borrado: relanza la app si la escritura sigue pendiente y muestra el aviso"""
+    start_sheet_sync(services)
+    aviso = st.session_state.pop("reminder_notice", None)
+    if aviso:
+        st.toast(aviso)
+
+@st.fragment
+def show_upcoming_maintenance(services):
+    """Próximos mantenimientos con botones de borrado; los clics solo repintan este fragmento"""
+    _after_delete(services)
+    # Mostrar próximos mantenimientos programados
+    st.markdown("---")
+    st.markdown("#### 📅 Próximos Mantenimientos Programados")
+    
+    try:
+        maint_df = services.maintenance()
+        if not maint_df.empty and 'Proximo_Mantenimiento' in maint_df.columns:
+            # Filtrar solo mantenimientos futuros con fechas válidas
+            future_maint = maint_df[
+                (maint_df['Proximo_Mantenimiento'].notna()) & 
+                (maint_df['Proximo_Mantenimiento'] > pd.Timestamp.now())
+            ].copy()
+            
+            if not future_maint.empty:
+                # Obtener el próximo mantenimiento de cada tipo
+                next_maint_by_type = future_maint.groupby('Tipo')['Proximo_Mantenimiento'].min().reset_index()
+                next_maint_by_type = next_maint_by_type.sort_values('Proximo_Mantenimiento')
+                
+                # Mostrar en tarjetas con botones de borrar
+                for i, (_, maint) in enumerate(next_maint_by_type.iterrows()):
+                    col1, col2 = st.columns([5, 1])
+                    
+                    with col1:
+                        days_until = (maint['Proximo_Mantenimiento'].date() - pd.Timestamp.now().date()).days
+                        
+                        st.markdown(maintenance_card_html(
+                            maint['Tipo'], maint['Proximo_Mantenimiento'].strftime('%d/%m/%Y'), days_until
+                        ), unsafe_allow_html=True)
+                    
+                    with col2:
+                        # Clave única para este mantenimiento
+                        delete_key = f"{maint['Tipo']}_{maint['Proximo_Mantenimiento'].strftime('%Y%m%d')}"
+                        
+                        # Verificar si está en modo confirmación
+                        if st.session_state.confirm_delete.get(delete_key, False):
+                            st.markdown("**¿Confirmar?**")
+                            col_si, col_no = st.columns(2)
+                            
+                            with col_si:
+                                st.button("✅", key=f"confirm_yes_{delete_key}", help="Confirmar borrado",
+                                          on_click=_delete_reminder,
+                                          args=(services, maint['Tipo'], maint['Proximo_Mantenimiento'], delete_key))
+                            
+                            with col_no:
+                                st.button("❌", key=f"confirm_no_{delete_key}", help="Cancelar",
+                                          on_click=_set_confirm_delete, args=(delete_key, False))
+                        
+                        else:
+                            # Botón inicial de borrar
+                            st.button("🗑️", 
+                                      key=f"delete_{delete_key}", 
+                                      help=f"Eliminar recordatorio: {maint['Tipo']}",
+                                      type="secondary",
+                                      on_click=_set_confirm_delete, args=(delete_key, True))
+            else:
+                st.info("📅 No hay mantenimientos programados próximamente.")
+        else:
+            st.info("📅 No hay datos de mantenimiento programado.")
+    except Exception as e:
+        st.error(f"Error mostrando próximos mantenimientos: {e}")
+
+
+@st.fragment
+def show_maintenance_history(services):
+    """Historial de mantenimiento y gestión de recordatorios; filtros y borrados solo repintan este fragmento"""
+    _after_delete(services)
+    st.markdown("#### 📋 Historial de Mantenimiento")
+    
+    # Obtener datos reales de mantenimiento
+    df_mant = services.maintenance()
+    
+    # PRIMERO definir los filtros
+    st.markdown("##### 🔍 Filtros")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        filtro_tipo = st.multiselect("Tipo:", ["Limpieza filtro", "Adición de químicos", "Cambio filtro", "Aspirado fondo", "Calibración sondas", "Limpieza skimmers", "Limpieza paredes", "Revisión célula sal"])
+    with col2:
+        desde = st.date_input("Desde:", value=date.today() - pd.Timedelta(days=30), key="mant_desde")
+    with col3:
+        hasta = st.date_input("Hasta:", value=date.today(), key="mant_hasta")
+    
+    # DESPUÉS usar los filtros
+    if not df_mant.empty:
+        # Aplicar filtros
+        df_mant_filtered = df_mant.copy()
+        
+        if filtro_tipo:  # Ahora sí está definido
+            df_mant_filtered = df_mant_filtered[df_mant_filtered['Tipo'].isin(filtro_tipo)]
+        
+        # Filtro por fechas
+        mask = (df_mant_filtered['Fecha'] >= pd.Timestamp(desde)) & (df_mant_filtered['Fecha'] <= pd.Timestamp(hasta))
+        df_mant_filtered = df_mant_filtered[mask]
+        
+        if not df_mant_filtered.empty:
+            # Formatear para mostrar
+            df_display = df_mant_filtered.copy()
+            df_display['Fecha'] = df_display['Fecha'].dt.strftime('%d/%m/%Y')
+            if 'Proximo_Mantenimiento' in df_display.columns:
+                df_display['Proximo_Mantenimiento'] = df_display['Proximo_Mantenimiento'].dt.strftime('%d/%m/%Y')
+            
+            st.dataframe(df_display, use_container_width=True)
+            # NUEVA SECCIÓN: Gestionar Recordatorios Programados
+            st.markdown("---")
+            st.markdown("##### 🗂️ Gestionar Recordatorios Programados")
+            
+            # Obtener mantenimientos con recordatorios activos
+            scheduled_maintenance = df_mant[
+                df_mant['Proximo_Mantenimiento'].notna()
+            ].copy()
+            
+            if not scheduled_maintenance.empty:
+                st.markdown("**Recordatorios activos de mantenimiento:**")
+                st.markdown("*Haz clic en 🗑️ para eliminar un recordatorio (requiere confirmación)*")
+                
+                # Ordenar por fecha de próximo mantenimiento
+                scheduled_maintenance = scheduled_maintenance.sort_values('Proximo_Mantenimiento')
+                
+                # Mostrar cada recordatorio con opción de borrar
+                for _, maintenance_row in scheduled_maintenance.iterrows():
+                    col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+                    
+                    days_until = (maintenance_row['Proximo_Mantenimiento'].date() - pd.Timestamp.now().date()).days
+                    
+                    # Determinar estado (la clase da el color)
+                    if days_until < 0:
+                        status = "🔴 VENCIDO"
+                        reminder_class = "reminder-overdue"
+                    elif days_until <= 2:
+                        status = "🟠 URGENTE"
+                        reminder_class = "reminder-urgent"
+                    elif days_until <= 7:
+                        status = "🟡 PRÓXIMO"
+                        reminder_class = "reminder-soon"
+                    else:
+                        status = "🟢 PROGRAMADO"
+                        reminder_class = "reminder-scheduled"
+                    
+                    with col1:
+                        st.markdown(f"""
+                        <div class="reminder-row {reminder_class}">
+                            <strong>{maintenance_row['Tipo']}</strong><br>
+                            <small>Último: {maintenance_row['Fecha'].strftime('%d/%m/%Y')}</small>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.markdown(f"""
+                        <div class="reminder-cell">
+                            <strong>📅 {maintenance_row['Proximo_Mantenimiento'].strftime('%d/%m/%Y')}</strong>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with col3:
+                        st.markdown(f"""
+                        <div class="reminder-cell {reminder_class}">
+                            <span class="reminder-status">{status}</span><br>
+                            <small>{abs(days_until)} día{'s' if abs(days_until) != 1 else ''}</small>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with col4:
+                        # Clave única para este mantenimiento
+                        hist_delete_key = f"hist_{maintenance_row['Tipo']}_{maintenance_row['Proximo_Mantenimiento'].strftime('%Y%m%d')}"
+                        
+                        # Verificar si está en modo confirmación
+                        if st.session_state.confirm_delete.get(hist_delete_key, False):
+                            col_si, col_no = st.columns(2)
+                            
+                            with col_si:
+                                st.button("✅", key=f"hist_confirm_yes_{hist_delete_key}", help="Confirmar",
+                                          on_click=_delete_reminder,
+                                          args=(services, maintenance_row['Tipo'],
+                                                maintenance_row['Proximo_Mantenimiento'], hist_delete_key))
+                            
+                            with col_no:
+                                st.button("❌", key=f"hist_confirm_no_{hist_delete_key}", help="Cancelar",
+                                          on_click=_set_confirm_delete, args=(hist_delete_key, False))
+                        
+                        else:
+                            # Botón inicial de borrar
+                            st.button("🗑️", 
+                                      key=f"hist_delete_{hist_delete_key}", 
+                                      help=f"Eliminar recordatorio: {maintenance_row['Tipo']}",
+                                      type="secondary",
+                                      on_click=_set_confirm_delete, args=(hist_delete_key, True))
+                    
+                    st.markdown("---")
+            else:
+                st.info("📅 No hay recordatorios programados actualmente.")
+        else:
+            st.info("📊 No hay registros que coincidan con los filtros.")
+    else:
+        st.info("📊 No hay registros de mantenimiento aún.")
+
+
+def render(services):
+    """🔧 Mantenimiento: nuevo registro, próximos mantenimientos e historial"""
+    st.markdown("### 🔧 Registro de Mantenimiento")
+
+    # Subtabs para organizar
+    mant_tab = st.radio("", ["📝 Nuevo Registro", "📋 Historial Mantenimiento"], horizontal=True)
+
+    if mant_tab == "📝 Nuevo Registro":
+        st.markdown("#### Registrar Nueva Tarea de Mantenimiento")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fecha_mant = st.date_input("📅 Fecha", value=date.today(), key="mant_fecha")
+            tipo_mant = st.selectbox("🔧 Tipo de Mantenimiento", [
+                "Aspirado fondo",
+                "Limpieza filtro",
+                "Adición de químicos",
+                "Cambio filtro", 
+                "Limpieza skimmers",
+                "Limpieza paredes",
+                "Calibración sondas",
+                "Revisión célula sal",
+                "Limpieza bomba",
+                "Cambio arena filtro",
+                "Mantenimiento general",
+                "Otro"
+            ])
+
+        with col2:
+            if tipo_mant == "Otro":
+                tipo_personalizado = st.text_input("Especificar tipo:")
+                tipo_final = tipo_personalizado if tipo_personalizado else "Otro"
+            else:
+                tipo_final = tipo_mant
+
+            estado_antes = st.selectbox("Estado antes", ["Bueno", "Regular", "Malo", "Crítico"])
+            tiempo_empleado = st.number_input("⏱️ Tiempo empleado (minutos)", min_value=0, value=5, step=5)
+
+        # Notas y observaciones
+        notas = st.text_area("📝 Notas y observaciones", 
+                            placeholder="Ej: Filtro muy sucio, cambié 3 bolas rotas, revisé presión bomba...")
+
+        # Próximo mantenimiento
+        st.markdown("#### 📅 Programar Próximo Mantenimiento")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            programar_siguiente = st.checkbox("Programar recordatorio")
+
+        with col2:
+            if programar_siguiente:
+                # Sugerencias automáticas según tipo
+                sugerencias_dias = {
+                    "Limpieza filtro": 5,
+                    "Adición de químicos": 3,                        
+                    "Limpieza skimmers": 3,
+                    "Aspirado fondo": 3,
+                    "Calibración sondas": 30,
+                    "Revisión célula sal": 30,
+                    "Cambio filtro": 365
+                }
+                dias_sugeridos = sugerencias_dias.get(tipo_final, 14)
+                fecha_siguiente = st.date_input("Próximo mantenimiento", 
+                                              value=fecha_mant + pd.Timedelta(days=dias_sugeridos))
+
+        # Botón guardar
+        st.markdown("---")
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            if st.button("💾 Guardar Registro de Mantenimiento", type="primary", use_container_width=True):
+                try:
+                    # Preparar datos para Google Sheets (nueva hoja o columnas adicionales)
+                    mant_data = [
+                        fecha_mant.strftime('%Y-%m-%d'),
+                        tipo_final,
+                        estado_antes,
+                        tiempo_empleado,
+                        notas,
+                        fecha_siguiente.strftime('%Y-%m-%d') if programar_siguiente else ""
+                    ]
+
+                    # Guardar en Google Sheets
+                    if services.add_maintenance_to_sheets(mant_data):
+                        st.success("✅ Registro guardado en Google Sheets!")
+                    else:
+                        st.error("❌ Error al guardar en Google Sheets")
+
+                    st.json({
+                        "Fecha": fecha_mant.strftime('%d/%m/%Y'),
+                        "Tipo": tipo_final,
+                        "Estado previo": estado_antes,
+                        "Tiempo": f"{tiempo_empleado} min",
+                        "Notas": notas,
+                        "Próximo": fecha_siguiente.strftime('%d/%m/%Y') if programar_siguiente else "No programado"
+                    })
+                    st.balloons()
+
+                except Exception as e:
+                    st.error(f"❌ Error al guardar: {e}")
+
+        show_upcoming_maintenance(services)
+
+    else:  # Historial Mantenimiento
+        show_maintenance_history(services)
@@ -0,0 +1,125 @@
+from datetime import datetime, date
+import streamlit as st
+from app_services import request_sheet_sync, start_sheet_sync
+from pool_analysis import RANGES, check_parameter_status, get_status_info
+
+
+def normalize_decimal(value):
+    """Convierte comas decimales en puntos para compatibilidad móvil"""
+    try:
+        value_str = str(value).replace(',', '.')
+        # Redondear a 3 decimales máximo para evitar problemas de precisión
+        return str(round(float(value_str), 3))
+    except (ValueError, TypeError):
+        return "0.0"
+
+@st.fragment
+def show_new_measurement_form(services):
+    """Formulario de nueva medición con su vista previa; al ser un fragmento, cada cambio solo repinta esta sección"""
+    st.markdown("### 📝 Registrar Nueva Medición")
+    
+    with st.container():
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### 📅 Información Temporal")
+            fecha = st.date_input("Fecha", value=date.today())
+            hora = st.time_input("Hora", value=datetime.now().time())
+            
+            st.markdown("#### 🧪 Parámetros electroquímicos")
+            ph = st.number_input("pH", min_value=0.0, max_value=14.0, value=7.4, step=0.1)
+            conductividad = st.number_input("Conductividad (µS/cm)", min_value=0, value=6000, step=100)
+            tds = st.number_input("TDS (ppm)", min_value=0, value=3000, step=50)
+            sal = st.number_input("Sal (ppm)", min_value=0, value=3000, step=100)
+
+        with col2:
+            st.markdown("#### 🔋 Desinfección y Ambiente")
+            orp = st.number_input("ORP (mV)", min_value=0, value=700, step=10)
+            fac = st.number_input("FAC (ppm)", min_value=0.0, max_value=10.0, value=0.5, step=0.1)
+            temperatura = st.number_input("Temperatura (°C)", min_value=0.0, max_value=50.0, value=25.0, step=0.5)
+            
+            st.markdown("#### 📝 Notas (Opcional)")
+            notas_medicion = st.text_area(
+                "Observaciones", 
+                placeholder="Ej: Después de lluvia, muchos bañistas, añadido cloro shock, limpiado filtro...",
+                height=80,
+                help="Información adicional que puede ayudar al análisis"
+            )
+    
+    
+    # Vista previa del estado
+    st.markdown("### 🚦 Vista Previa del Estado")
+    
+    # Normalizar para vista previa
+    try:
+        params = {
+            'pH': normalize_decimal(ph), 
+            'Conductividad': normalize_decimal(conductividad), 
+            'TDS': normalize_decimal(tds), 
+            'Sal': normalize_decimal(sal), 
+            'ORP': normalize_decimal(orp), 
+            'FAC': normalize_decimal(fac),
+            'Temperatura': normalize_decimal(temperatura)
+        }
+    except ValueError:
+        st.error("⚠️ Error en formato de números. Verifica que uses punto (.) como separador decimal.")
+        params = {'pH': 0, 'Conductividad': 0, 'TDS': 0, 'Sal': 0, 'ORP': 0, 'FAC': 0}
+    
+    cols = st.columns(3)
+    for i, (param, value) in enumerate(params.items()):
+        with cols[i % 3]:
+            status = check_parameter_status(value, param)
+            status_info = get_status_info(status)
+            icon = RANGES.get(param, {}).get('icon', '📊')
+            unit = RANGES.get(param, {}).get('unit', '')
+            
+            st.markdown(f"""
+            <div class="preview-card">
+                <div class="preview-icon">{icon}</div>
+                <div class="preview-param">{param}</div>
+                <div class="preview-value">{value} {unit}</div>
+                <div class="status-text {status_info['class']}">{status_info['text']}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Botón para guardar mejorado
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        if st.button("💾 Guardar Medición", type="primary", use_container_width=True):
+            # Normalizar decimales (convertir comas en puntos)
+            try:
+                ph_norm = str(round(float(str(ph).replace(',', '.')), 2))
+                conductividad_norm = str(round(float(str(conductividad).replace(',', '.')), 0))
+                tds_norm = str(round(float(str(tds).replace(',', '.')), 0))
+                sal_norm = str(round(float(str(sal).replace(',', '.')), 0))
+                orp_norm = str(round(float(str(orp).replace(',', '.')), 0))
+                fac_norm = str(round(float(str(fac).replace(',', '.')), 2))
+                temperatura_norm = str(round(float(str(temperatura).replace(',', '.')), 1))
+                
+                data_row = [
+                    fecha.strftime('%Y-%m-%d'),
+                    hora.strftime('%H:%M'),
+                    ph_norm, conductividad_norm, tds_norm, sal_norm, orp_norm, fac_norm, temperatura_norm,
+                    notas_medicion  # Nueva columna de notas
+                ]
+                
+                if services.add_data_to_sheets(data_row):
+                    # Si la escritura sigue pendiente se relanza la app entera para seguirla;
+                    # el aviso se muestra abajo en esa ejecución
+                    st.session_state.measurement_saved = True
+                    request_sheet_sync()
+                    start_sheet_sync(services)
+                else:
+                    st.error("❌ Error al guardar la medición")
+            except ValueError:
+                st.error("⚠️ Error en formato de números. Verifica los valores introducidos.")
+
+        if st.session_state.pop("measurement_saved", False):
+            st.success("✅ ¡Medición guardada correctamente!")
+            st.balloons()
+
+
+def render(services):
+    """📝 Nueva Medición: formulario con vista previa del estado"""
+    show_new_measurement_form(services)
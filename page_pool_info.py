@@ -0,0 +1,558 @@
+import pandas as pd
+import streamlit as st
+
+
+# ============================================================================
+# 🏊‍♂️ FUNCIONES PARA INFORMACIÓN DE PISCINA
+# ============================================================================
+
+def update_pool_info(info_sheet, campo, valor, notas=""):
+    """Actualiza un campo específico de información de la piscina"""
+    try:
+        if info_sheet is None:
+            return False
+            
+        # Obtener todos los datos
+        all_data = info_sheet.get_all_values()
+        
+        # Buscar la fila del campo
+        for row_num, row_data in enumerate(all_data):
+            if len(row_data) > 0 and row_data[0] == campo:
+                # Actualizar la fila (row_num + 1 porque Google Sheets usa índice base-1)
+                info_sheet.update_cell(row_num + 1, 2, str(valor))  # Columna B = Valor
+                if notas:
+                    info_sheet.update_cell(row_num + 1, 3, str(notas))  # Columna C = Notas
+                return True
+        
+        # Si no existe el campo, añadirlo
+        info_sheet.append_row([campo, str(valor), str(notas)])
+        return True
+        
+    except Exception as e:
+        st.error(f"Error actualizando información: {e}")
+        return False
+
+def calculate_pool_volume(largo, ancho, prof_promedio):
+    """Calcula el volumen de la piscina en litros"""
+    try:
+        largo_f = float(str(largo).replace(',', '.'))
+        ancho_f = float(str(ancho).replace(',', '.'))
+        prof_f = float(str(prof_promedio).replace(',', '.'))
+        
+        # Volumen en metros cúbicos * 1000 = litros
+        volumen_m3 = largo_f * ancho_f * prof_f
+        volumen_litros = volumen_m3 * 1000
+        
+        return round(volumen_litros, 0)
+    except:
+        return 0
+
+# ============================================================================
+# 🧪 CALCULADORA DE QUÍMICOS
+# ============================================================================
+
+def calculate_chemical_amounts(volumen_litros, chemical_type, current_value, target_value):
+    """
+    Calcula la cantidad de químico necesaria según el volumen de la piscina
+    
+    Parámetros:
+    - volumen_litros: Volumen de la piscina en litros
+    - chemical_type: Tipo de químico ('ph_minus', 'ph_plus', 'sal', 'cloro_shock', etc.)
+    - current_value: Valor actual del parámetro
+    - target_value: Valor deseado del parámetro
+    
+    Retorna:
+    - cantidad: Cantidad necesaria del químico
+    - unidad: Unidad de medida
+    - instrucciones: Instrucciones de aplicación
+    """
+    
+    if volumen_litros <= 0:
+        return 0, "", "Primero define el volumen de tu piscina en la pestaña Dimensiones"
+    
+    # Ratios estándar por 1000 litros
+    chemical_ratios = {
+        'ph_minus': {
+            'ratio_per_1000L':  5,  # 5g de TAMAR Reductor pH granulado por 1000L para bajar 0.1 pH
+            'unit': 'g',
+            'param_change': 0.1,
+            'instructions': 'Diluir en un cubo de agua y verter lentamente en la piscina con la bomba funcionando. Esperar 2-4 horas antes de medir.'
+        },
+        'ph_plus': {
+            'ratio_per_1000L': 5,  # 5g de Incrementador de pH granulado para subir 0.1 pH
+            'unit': 'g',
+            'param_change': 0.1,
+            'instructions': 'Disolver completamente en agua tibia antes de añadir. Aplicar con bomba funcionando. Esperar 4-6 horas antes de medir.'
+        },
+        'sal': {
+            'ratio_per_1000L': 1000,  # 1kg por 1000L para subir 1000ppm de sal
+            'unit': 'g',
+            'param_change': 1000,
+            'instructions': 'Añadir directamente en la piscina con bomba funcionando. La sal tardará 24-48h en disolverse completamente.'
+        },
+        'cloro_shock': {
+            'ratio_per_1000L': 15,  # 15g de cloro granulado por 1000L para shock (subir ~2ppm FAC)
+            'unit': 'g',
+            'param_change': 2.0,
+            'instructions': 'Disolver en cubo de agua. Aplicar al atardecer con bomba funcionando. No bañarse hasta que FAC baje a <3ppm.'
+        },
+        'alguicida': {
+            'ratio_per_1000L': 5,  # 5ml por 1000L para mantenimiento
+            'unit': 'ml',
+            'param_change': 1,  # Dosis de mantenimiento
+            'instructions': 'Aplicar directamente en la piscina. Para tratamiento intensivo, doblar la dosis.'
+        },
+        'clarificador': {
+            'ratio_per_1000L': 3,  # 3ml por 1000L
+            'unit': 'ml', 
+            'param_change': 1,
+            'instructions': 'Aplicar con bomba funcionando. Mantener filtración 24h seguidas. Aspirar precipitado después de 48h.'
+        }
+    }
+    
+    if chemical_type not in chemical_ratios:
+        return 0, "", "Tipo de químico no reconocido"
+    
+    ratio_info = chemical_ratios[chemical_type]
+    
+    # Calcular diferencia necesaria
+    if chemical_type == 'sal':
+        # Para sal, current_value y target_value son en ppm
+        difference = target_value - current_value
+        if difference <= 0:
+            return 0, ratio_info['unit'], "No es necesario añadir sal"
+        
+        # Calcular cantidad proporcionalmente
+        cantidad_base = ratio_info['ratio_per_1000L']
+        cantidad_total = (volumen_litros / 1000) * cantidad_base * (difference / ratio_info['param_change'])
+        
+    elif chemical_type in ['ph_minus', 'ph_plus']:
+        # Para pH, calcular diferencia en unidades de pH
+        difference = abs(target_value - current_value)
+        if difference < 0.05:  # Diferencia mínima significativa
+            return 0, ratio_info['unit'], "El pH ya está en el rango objetivo"
+        
+        # Verificar dirección correcta
+        if chemical_type == 'ph_minus' and target_value >= current_value:
+            return 0, ratio_info['unit'], "Usa pH+ para subir el pH, no pH-"
+        if chemical_type == 'ph_plus' and target_value <= current_value:
+            return 0, ratio_info['unit'], "Usa pH- para bajar el pH, no pH+"
+        
+        cantidad_base = ratio_info['ratio_per_1000L']
+        cantidad_total = (volumen_litros / 1000) * cantidad_base * (difference / ratio_info['param_change'])
+        
+    else:
+        # Para otros químicos (cloro shock, alguicida, clarificador)
+        cantidad_base = ratio_info['ratio_per_1000L']
+        cantidad_total = (volumen_litros / 1000) * cantidad_base
+    
+    return round(cantidad_total, 1), ratio_info['unit'], ratio_info['instructions']
+
+def show_chemical_calculator(volumen_litros):
+    """Muestra la interfaz de la calculadora de químicos"""
+    
+   
+    if volumen_litros <= 0:
+        st.warning("⚠️ Primero define el volumen de tu piscina en la pestaña **Dimensiones**")
+        return
+    
+    st.success(f"📏 Volumen de tu piscina: **{volumen_litros:,.0f} litros**")
+    
+    # Pestañas para diferentes tipos de químicos
+    chem_tabs = st.tabs(["🧪 pH", "🧂 Sal", "💊 Cloro Shock", "🌿 Alguicida", "✨ Clarificador"])
+    
+    # ===== TAB pH =====
+    with chem_tabs[0]:
+        st.markdown("##### Corrección de pH")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            ph_actual = st.number_input("pH actual", min_value=6.0, max_value=9.0, value=7.0, step=0.1, key="ph_actual")
+            ph_objetivo = st.number_input("pH objetivo", min_value=6.0, max_value=9.0, value=7.4, step=0.1, key="ph_objetivo")
+        
+        with col2:
+            if ph_objetivo > ph_actual:
+                # Necesita pH+
+                cantidad, unidad, instrucciones = calculate_chemical_amounts(volumen_litros, 'ph_plus', ph_actual, ph_objetivo)
+                if cantidad > 0:
+                    st.success(f"📈 **Necesitas pH+ (Carbonato Sódico)**")
+                    st.metric("Cantidad necesaria", f"{cantidad} {unidad}")
+                else:
+                    st.info("ℹ️ No necesitas ajustar el pH")
+            elif ph_objetivo < ph_actual:
+                # Necesita pH-
+                cantidad, unidad, instrucciones = calculate_chemical_amounts(volumen_litros, 'ph_minus', ph_actual, ph_objetivo)
+                if cantidad > 0:
+                    st.error(f"📉 **Necesitas pH- (Reductor pH Grano)**")
+                    st.metric("Cantidad necesaria", f"{cantidad} {unidad}")
+                else:
+                    st.info("ℹ️ No necesitas ajustar el pH")
+            else:
+                st.info("✅ El pH ya está en el objetivo")
+                cantidad, unidad, instrucciones = 0, "", ""
+        
+        if cantidad > 0:
+            st.markdown("**📋 Instrucciones:**")
+            st.info(instrucciones)
+    
+    # ===== TAB SAL =====
+    with chem_tabs[1]:
+        st.markdown("##### Corrección de Salinidad")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            sal_actual = st.number_input("Sal actual (ppm)", min_value=0, max_value=6000, value=3000, step=100, key="sal_actual")
+            sal_objetivo = st.number_input("Sal objetivo (ppm)", min_value=2000, max_value=5000, value=3500, step=100, key="sal_objetivo")
+        
+        with col2:
+            cantidad, unidad, instrucciones = calculate_chemical_amounts(volumen_litros, 'sal', sal_actual, sal_objetivo)
+            if cantidad > 0:
+                # Convertir a kg si es mucho
+                if cantidad >= 1000:
+                    st.success(f"🧂 **Sal necesaria: {cantidad/1000:.1f} kg**")
+                else:
+                    st.success(f"🧂 **Sal necesaria: {cantidad} g**")
+                
+                # Mostrar coste aproximado
+                precio_sal_kg = 1.5  # €/kg aproximado
+                coste = (cantidad/1000) * precio_sal_kg
+                st.metric("Coste aproximado", f"{coste:.2f} €")
+            else:
+                st.info("✅ La salinidad ya está en el objetivo")
+        
+        if cantidad > 0:
+            st.markdown("**📋 Instrucciones:**")
+            st.info(instrucciones)
+    
+    # ===== TAB CLORO SHOCK =====
+    with chem_tabs[2]:
+        st.markdown("##### Cloración Shock")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**¿Cuándo usar cloro shock?**")
+            st.markdown("- Agua verde/turbia")
+            st.markdown("- Después de lluvia intensa")
+            st.markdown("- Muchos bañistas")
+            st.markdown("- FAC muy bajo (<0.5 ppm)")
+        
+        with col2:
+            cantidad, unidad, instrucciones = calculate_chemical_amounts(volumen_litros, 'cloro_shock', 0, 2)
+            st.success(f"💊 **Cloro granulado necesario**")
+            st.metric("Dosis shock estándar", f"{cantidad} {unidad}")
+            
+            # Dosis intensiva
+            cantidad_intensiva = cantidad * 1.5
+            st.metric("Dosis intensiva (agua muy verde)", f"{cantidad_intensiva:.0f} {unidad}")
+        
+        st.markdown("**📋 Instrucciones:**")
+        st.info(instrucciones)
+        st.warning("⚠️ **Importante:** Aplicar solo al atardecer. No bañarse hasta que FAC <3ppm")
+    
+    # ===== TAB ALGUICIDA =====
+    with chem_tabs[3]:
+        st.markdown("##### Tratamiento Alguicida")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            tratamiento = st.selectbox("Tipo de tratamiento", 
+                                     ["Mantenimiento preventivo", "Tratamiento curativo"])
+        
+        with col2:
+            cantidad, unidad, instrucciones = calculate_chemical_amounts(volumen_litros, 'alguicida', 0, 1)
+            
+            if tratamiento == "Mantenimiento preventivo":
+                st.success(f"🌿 **Dosis mantenimiento**")
+                st.metric("Cantidad", f"{cantidad} {unidad}")
+                st.info("Aplicar cada 15 días")
+            else:
+                cantidad_curativa = cantidad * 2
+                st.warning(f"🌿 **Dosis curativa**")
+                st.metric("Cantidad", f"{cantidad_curativa:.0f} {unidad}")
+                st.info("Aplicar diariamente hasta eliminar algas")
+        
+        st.markdown("**📋 Instrucciones:**")
+        st.info(instrucciones)
+    
+    # ===== TAB CLARIFICADOR =====
+    with chem_tabs[4]:
+        st.markdown("##### Clarificador de Agua")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**¿Cuándo usar clarificador?**")
+            st.markdown("- Agua turbia/lechosa")
+            st.markdown("- Después de shock químico")
+            st.markdown("- Partículas en suspensión")
+            st.markdown("- Filtro no retiene partículas finas")
+        
+        with col2:
+            cantidad, unidad, instrucciones = calculate_chemical_amounts(volumen_litros, 'clarificador', 0, 1)
+            st.success(f"✨ **Clarificador necesario**")
+            st.metric("Cantidad", f"{cantidad} {unidad}")
+        
+        st.markdown("**📋 Instrucciones:**")
+        st.info(instrucciones)
+        st.warning("⚠️ **Importante:** Mantener filtración 24h. Aspirar fondo después de 48h")
+
+
+def render(services):
+    """🏊‍♂️ Info Piscina: dimensiones, equipamiento, notas y calculadora de químicos"""
+    st.markdown("### 🏊‍♂️ Información de la Piscina")
+
+    info_sheet = services.info_sheet
+    if info_sheet is None:
+        st.warning("⚠️ La hoja de información no está disponible.")
+        if st.button("🔄 Reintentar crear hoja", type="primary"):
+            st.cache_resource.clear()
+            st.rerun()
+        return
+
+    # Obtener información actual
+    pool_info = services.pool_info()
+
+    # Tabs para organizar la información
+    info_tabs = st.tabs(["📏 Dimensiones", "⚙️ Equipamiento", "📋 General", "🧪 Químicos"])
+
+    # ==================== TAB 1: DIMENSIONES ====================
+    with info_tabs[0]:
+        st.markdown("#### 📏 Dimensiones y Volumen")
+
+        with st.form("dimensiones_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                largo = st.number_input(
+                    "Largo (metros)", 
+                    min_value=0.0, 
+                    value=float(pool_info.get('Largo_Metros', {}).get('valor', 0)),
+                    step=0.1,
+                    help="Largo de la piscina en metros"
+                )
+
+                ancho = st.number_input(
+                    "Ancho (metros)", 
+                    min_value=0.0, 
+                    value=float(pool_info.get('Ancho_Metros', {}).get('valor', 0)),
+                    step=0.1,
+                    help="Ancho de la piscina en metros"
+                )
+
+                profundidad = st.number_input(
+                    "Profundidad promedio (metros)", 
+                    min_value=0.0, 
+                    value=float(pool_info.get('Profundidad_Metros', {}).get('valor', 0)),
+                    step=0.1,
+                    help="Profundidad promedio de la piscina"
+                )
+
+            with col2:
+                # Calcular volumen automáticamente
+                volumen_calculado = calculate_pool_volume(largo, ancho, profundidad)
+
+                st.markdown("**📊 Información calculada:**")
+                st.info(f"🌊 **Volumen total:** {volumen_calculado:,.0f} litros")
+
+                if largo > 0 and ancho > 0:
+                    superficie = largo * ancho
+                    st.info(f"📐 **Superficie:** {superficie:.1f} m²")
+
+                if volumen_calculado > 0:
+                    st.info(f"💧 **Renovación 8h:** {volumen_calculado/8:,.0f} L/h")
+
+            # Ubicación
+            ubicacion = st.text_input(
+                "📍 Ubicación", 
+                value=pool_info.get('Ubicacion', {}).get('valor', ''),
+                placeholder="Ej: Jardín trasero, Terraza, etc."
+            )
+
+            fecha_instalacion = st.date_input(
+                "📅 Fecha de instalación",
+                value=pd.to_datetime(pool_info.get('Fecha_Instalacion', {}).get('valor', '2020-01-01'), errors='coerce').date() if pool_info.get('Fecha_Instalacion', {}).get('valor') else None,
+                help="Fecha de instalación de la piscina"
+            )
+
+            if st.form_submit_button("💾 Guardar Dimensiones", type="primary"):
+                # Guardar todos los campos
+                success_count = 0
+
+                if update_pool_info(info_sheet, "Largo_Metros", largo, "Largo en metros"):
+                    success_count += 1
+                if update_pool_info(info_sheet, "Ancho_Metros", ancho, "Ancho en metros"):
+                    success_count += 1
+                if update_pool_info(info_sheet, "Profundidad_Metros", profundidad, "Profundidad promedio"):
+                    success_count += 1
+                if update_pool_info(info_sheet, "Volumen_Litros", volumen_calculado, "Volumen total calculado"):
+                    success_count += 1
+                if update_pool_info(info_sheet, "Ubicacion", ubicacion, "Ubicación de la piscina"):
+                    success_count += 1
+                if fecha_instalacion and update_pool_info(info_sheet, "Fecha_Instalacion", fecha_instalacion.strftime('%Y-%m-%d'), "Fecha de instalación"):
+                    success_count += 1
+
+                if success_count > 0:
+                    st.success(f"✅ Información guardada correctamente! ({success_count} campos)")
+                    st.balloons()
+                else:
+                    st.error("❌ Error al guardar la información")
+
+    # ==================== TAB 2: EQUIPAMIENTO ====================
+    with info_tabs[1]:
+        st.markdown("#### ⚙️ Equipamiento")
+
+        with st.form("equipamiento_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.markdown("**💧 Sistema de Filtración**")
+
+                bomba_modelo = st.text_input(
+                    "Bomba (modelo)", 
+                    value=pool_info.get('Bomba_Modelo', {}).get('valor', ''),
+                    placeholder="Ej: Hayward Super Pump 1.5 HP"
+                )
+
+                filtro_opciones = ["", "Arena", "Cartucho", "Diatomea", "Vidrio", "Otro"]
+                filtro_tipo = st.selectbox(
+                    "Tipo de filtro",
+                    filtro_opciones,
+                    index=0 if not pool_info.get('Filtro_Tipo', {}).get('valor') else 
+                          filtro_opciones.index(pool_info.get('Filtro_Tipo', {}).get('valor')) if pool_info.get('Filtro_Tipo', {}).get('valor') in filtro_opciones else 0
+                )
+
+                clorador_modelo = st.text_input(
+                    "Clorador salino", 
+                    value=pool_info.get('Clorador_Modelo', {}).get('valor', ''),
+                    placeholder="Ej: Hayward AquaRite 25000L"
+                )
+
+            with col2:
+                st.markdown("**⚡ Configuración Actual**")
+
+                generador_porcentaje = st.slider(
+                    "% Generador salino",
+                    min_value=0,
+                    max_value=100,
+                    value=int(pool_info.get('Generador_Porcentaje', {}).get('valor', 50)),
+                    help="Porcentaje actual del generador de cloro"
+                )
+
+                st.markdown("**🔄 Horarios de funcionamiento**")
+                # Estos podrían ser campos adicionales
+                st.info("💡 Tip: Configura el generador al 60-80% en verano y 40-60% en invierno")
+
+            if st.form_submit_button("💾 Guardar Equipamiento", type="primary"):
+                success_count = 0
+
+                if update_pool_info(info_sheet, "Bomba_Modelo", bomba_modelo, "Modelo de la bomba"):
+                    success_count += 1
+                if update_pool_info(info_sheet, "Filtro_Tipo", filtro_tipo, "Tipo de filtro"):
+                    success_count += 1
+                if update_pool_info(info_sheet, "Clorador_Modelo", clorador_modelo, "Modelo clorador salino"):
+                    success_count += 1
+                if update_pool_info(info_sheet, "Generador_Porcentaje", generador_porcentaje, "% actual del generador"):
+                    success_count += 1
+
+                if success_count > 0:
+                    st.success(f"✅ Equipamiento guardado correctamente! ({success_count} campos)")
+                else:
+                    st.error("❌ Error al guardar el equipamiento")
+
+    # ==================== TAB 3: GENERAL ====================
+    with info_tabs[2]:
+        st.markdown("#### 📋 Información General")
+
+        with st.form("general_form"):
+            notas_generales = st.text_area(
+                "📝 Notas importantes",
+                value=pool_info.get('Notas_Generales', {}).get('valor', ''),
+                placeholder="Ej: Cambiar filtro cada 6 meses, revisar junta bomba, célula sal garantía hasta 2025...",
+                height=100
+            )
+
+            if st.form_submit_button("💾 Guardar Notas", type="primary"):
+                if update_pool_info(info_sheet, "Notas_Generales", notas_generales, "Notas importantes"):
+                    st.success("✅ Notas guardadas correctamente!")
+                else:
+                    st.error("❌ Error al guardar las notas")
+
+        # Resumen de información
+        st.markdown("---")
+        st.markdown("#### 📊 Resumen de tu Piscina")
+
+        if pool_info:
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                volumen = pool_info.get('Volumen_Litros', {}).get('valor', '0')
+                st.metric("🌊 Volumen", f"{volumen} L" if volumen != '0' else "No definido")
+
+                ubicacion_resumen = pool_info.get('Ubicacion', {}).get('valor', 'No definida')
+                st.metric("📍 Ubicación", ubicacion_resumen)
+
+            with col2:
+                bomba = pool_info.get('Bomba_Modelo', {}).get('valor', 'No definida')
+                st.metric("💧 Bomba", bomba[:20] + "..." if len(bomba) > 20 else bomba)
+
+                filtro = pool_info.get('Filtro_Tipo', {}).get('valor', 'No definido')
+                st.metric("🔄 Filtro", filtro)
+
+            with col3:
+                generador = pool_info.get('Generador_Porcentaje', {}).get('valor', '0')
+                st.metric("⚡ Generador", f"{generador}%")
+
+                fecha_inst = pool_info.get('Fecha_Instalacion', {}).get('valor', '')
+                if fecha_inst:
+                    try:
+                        fecha_obj = pd.to_datetime(fecha_inst)
+                        años = (pd.Timestamp.now() - fecha_obj).days // 365
+                        st.metric("📅 Antigüedad", f"{años} años")
+                    except:
+                        st.metric("📅 Instalación", fecha_inst)
+                else:
+                    st.metric("📅 Instalación", "No definida")
+        else:
+            st.info("📝 Completa la información de tu piscina en las pestañas superiores")
+
+    # ==================== TAB 4: QUÍMICOS ====================
+    with info_tabs[3]:
+        st.markdown("#### 🧪 Calculadora de Químicos")
+
+        # Obtener volumen actual
+        volumen_actual = float(pool_info.get('Volumen_Litros', {}).get('valor', 0))
+
+        # Mostrar calculadora
+        show_chemical_calculator(volumen_actual)
+
+        # Información adicional
+        st.markdown("---")
+        st.markdown("#### 📚 Información Útil")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown("""
+            **🎯 Rangos Óptimos:**
+            - pH: 7.2 - 7.6
+            - Sal: 2700 - 4500 ppm
+            - FAC: 1.0 - 3.0 ppm
+            - ORP: 650 - 750 mV
+            """)
+
+        with col2:
+            st.markdown("""
+            **⚠️ Precauciones:**
+            - Nunca mezclar químicos
+            - Aplicar al atardecer
+            - Bomba siempre funcionando
+            - Esperar entre aplicaciones
+            """)
+
+        with col3:
+            st.markdown("""
+            **🛒 Químicos Básicos:**
+            - pH- (Reductor pH Grano)
+            - pH+ (Incrementador pH Granulado)
+            - Sal especial piscinas
+            - Cloro granulado shock
+            """)    
@@ -0,0 +1,132 @@
+import streamlit as st
+from pool_analysis import RANGES
+
+
+def render(services):
+    """ℹ️ Rangos Óptimos: guía de parámetros y calendario de mantenimiento"""
+    st.markdown("### 📚 Guía Completa de Parámetros")
+
+    # Tabla de rangos mejorada
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown("#### 📊 Rangos Óptimos")
+
+        for param, info in RANGES.items():
+            st.markdown(f"""
+            <div class="dashboard-card range-card">
+                <div class="range-row">
+                    <div class="range-name">
+                        <span class="range-icon">{info['icon']}</span>
+                        <strong class="range-param">{param}</strong>
+                    </div>
+                    <div class="range-value">{info['min']} - {info['max']} {info['unit']}</div>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("#### 🎯 Estado Ideal")
+        st.markdown("""
+        <div class="dashboard-card ideal-card">
+            <div class="ideal-icon">🏊‍♂️</div>
+            <h3 class="ideal-title">Piscina Perfecta</h3>
+            <p class="ideal-text">
+                Todos los parámetros en rango óptimo garantizan:
+            </p>
+            <ul class="ideal-text ideal-list">
+                <li>Agua cristalina</li>
+                <li>Desinfección eficaz</li>
+                <li>Equipo protegido</li>
+                <li>Experiencia confortable</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Consejos expandidos
+    st.markdown("### 💡 Consejos Avanzados")
+
+    tips_tabs = st.tabs(["🧪 pH", "🧂 Sal", "🔋 ORP", "⚡ Conductividad", "💧 TDS", "🟢 FAC"])
+
+    with tips_tabs[0]:
+        st.markdown("""
+        **pH (7.2 - 7.6) - El parámetro más crítico** 🧪
+
+        - **Por qué es importante**: Afecta directamente la eficiencia del generador de cloro
+        - **pH alto (>7.6)**: Reduce drásticamente la producción de cloro, agua turbia
+        - **pH bajo (<7.2)**: Corrosión del equipo, irritación ocular
+        - **Soluciones**: Usar pH- (ácido muriático) o pH+ (carbonato sódico)
+        """)
+
+    with tips_tabs[1]:
+        st.markdown("""
+        **Sal (2700 - 4500 ppm) - Combustible del sistema** 🧂
+
+        - **Función**: Necesaria para la electrólisis que produce cloro
+        - **Muy baja (<2700)**: El equipo no funcionará, alarmas
+        - **Muy alta (>4500)**: Daños al equipo, corrosión acelerada
+        - **Tip**: Añadir sal granulada específica para piscinas
+        """)
+
+    with tips_tabs[2]:
+        st.markdown("""
+        **ORP (650 - 750 mV) - Poder desinfectante real** 🔋
+
+        - **Más importante que FAC**: Mide capacidad real de desinfección
+        - **Bajo (<650)**: Agua no segura, posible contaminación
+        - **Alto (>750)**: Sobredesinfección, irritación
+        - **Influencia**: pH, temperatura, cyanuric acid
+        """)
+
+    with tips_tabs[3]:
+        st.markdown("""
+        **Conductividad (3000 - 8000 µS/cm) - Medida indirecta de sal** ⚡
+
+        - **Relación**: Directamente proporcional al contenido de sal
+        - **Uso**: Verificar mediciones de salinidad
+        - **Ventaja**: Respuesta más rápida que medidores de sal
+        - **Factor**: Temperatura afecta las lecturas
+        """)
+
+    with tips_tabs[4]:
+        st.markdown("""
+        **TDS (1500 - 4500 ppm) - Sólidos disueltos totales** 💧
+
+        - **Incluye**: Sal + otros minerales disueltos
+        - **Indicador**: Calidad general del agua
+        - **Alto**: Puede indicar acumulación de contaminantes
+        - **Mantenimiento**: Renovación parcial de agua
+        """)
+
+    with tips_tabs[5]:
+        st.markdown("""
+        **FAC (1.0 - 3.0 ppm) - Cloro libre disponible** 🟢
+
+        - **Función**: Desinfección activa del agua
+        - **Generación**: Automática por electrólisis de sal
+        - **Variables**: pH, temperatura, bañistas, weather
+        - **Control**: Ajustar % generador según necesidades
+        """)
+
+    # Calendario de mantenimiento
+    st.markdown("### 📅 Calendario de Mantenimiento Recomendado")
+
+    maintenance_schedule = {
+        "Diario": ["Verificar funcionamiento del equipo", "Limpiar skimmers"],
+        "Semanal": ["Medir todos los parámetros", "Limpiar filtros", "Aspirar fondo"],
+        "Quincenal": ["Calibrar sondas", "Revisar células de sal", "Análisis completo agua"],
+        "Mensual": ["Limpieza profunda filtros", "Inspección equipos", "Verificar conexiones"],
+        "Estacional": ["Mantenimiento preventivo", "Cambio de piezas desgaste", "Análisis profesional"]
+    }
+
+    cols = st.columns(len(maintenance_schedule))
+    for i, (periodo, tareas) in enumerate(maintenance_schedule.items()):
+        with cols[i]:
+            st.markdown(f"""
+            <div class="dashboard-card schedule-card">
+                <h4 class="schedule-title">{periodo}</h4>
+                <ul class="schedule-list">
+                    {''.join([f'<li>{tarea}</li>' for tarea in tareas])}
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
@@ -0,0 +1,18 @@
+import importlib
+
+# Páginas del menú lateral -> módulo con su render(services).
+# Cada módulo (y lo que importa: IA, gráficos...) se carga la primera vez que se abre su página.
+PAGES = {
+    "🏠 Dashboard": "page_dashboard",
+    "📝 Nueva Medición": "page_measurement",
+    "📈 Gráficos": "page_charts",
+    "📋 Historial": "page_history",
+    "🔧 Mantenimiento": "page_maintenance",
+    "🏊‍♂️ Info Piscina": "page_pool_info",
+    "ℹ️ Rangos Óptimos": "page_ranges",
+}
+
+
+def render_page(label, services):
+    """Importa el módulo de la página (solo la primera vez en el proceso) y la pinta"""
+    importlib.import_module(PAGES[label]).render(services)
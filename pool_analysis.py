@@ -0,0 +1,203 @@
+import pandas as pd
+
+# Rangos óptimos para piscina de sal
+RANGES = {
+    'pH': {'min': 7.2, 'max': 7.6, 'unit': '', 'icon': '🧪'},
+    'Conductividad': {'min': 4000, 'max': 8000, 'unit': 'µS/cm', 'icon': '⚡'},
+    'TDS': {'min': 2000, 'max': 4500, 'unit': 'ppm', 'icon': '💧'},
+    'Sal': {'min': 2700, 'max': 4500, 'unit': 'ppm', 'icon': '🧂'},
+    'ORP': {'min': 650, 'max': 750, 'unit': 'mV', 'icon': '🔋'},
+    'FAC': {'min': 1.0, 'max': 3.0, 'unit': 'ppm', 'icon': '🟢'},
+    'Temperatura': {'min': 22, 'max': 32, 'unit': '°C', 'icon': '🌡️'}
+}
+
+def check_parameter_status(value, param):
+    """Verifica si un parámetro está en rango óptimo"""
+    if param not in RANGES:
+        return "unknown"
+    
+    try:
+        # Asegurar que value es un número
+        if isinstance(value, str):
+            value = float(value.replace(',', '.'))
+        else:
+            value = float(value)
+        
+        min_val = RANGES[param]['min']
+        max_val = RANGES[param]['max']
+        
+        if min_val <= value <= max_val:
+            return "optimal"
+        elif value < min_val:
+            return "low"
+        else:
+            return "high"
+    except (ValueError, TypeError):
+        return "unknown"
+
+def get_status_info(status):
+    """Devuelve información del estado del parámetro"""
+    status_info = {
+        "optimal": {"color": "#00ff00", "text": "ÓPTIMO", "class": "status-optimal"},
+        "low": {"color": "#ffa500", "text": "BAJO", "class": "status-warning"},
+        "high": {"color": "#ff0000", "text": "ALTO", "class": "status-critical"},
+        "unknown": {"color": "#gray", "text": "DESCONOCIDO", "class": "status-warning"}
+    }
+    return status_info.get(status, status_info["unknown"])
+
+def data_state_fingerprint(df):
+    """Estado aproximado de los datos: estado (bajo/óptimo/alto) de cada parámetro en la última medición"""
+    if df.empty:
+        return "sin-datos"
+    latest_data = df.iloc[-1]
+    return "|".join(
+        f"{param}:{check_parameter_status(latest_data[param], param) if param in latest_data else 'unknown'}"
+        for param in RANGES
+    )
+
+def analyze_alerts(df, maint_df=None):
+    """Analiza los datos y genera alertas para el dashboard"""
+    alerts = []
+    
+    if df.empty:
+        return alerts
+    
+    latest_data = df.iloc[-1]
+    
+    # 1. Alertas por parámetros críticos
+    critical_params = []
+    for param in ['pH', 'Sal', 'FAC', 'ORP', 'TDS', 'Conductividad']:
+        if param in latest_data:
+            status = check_parameter_status(latest_data[param], param)
+            if status in ['low', 'high']:
+                critical_params.append({
+                    'param': param,
+                    'value': latest_data[param],
+                    'status': status,
+                    'unit': RANGES.get(param, {}).get('unit', ''),
+                    'icon': RANGES.get(param, {}).get('icon', '⚠️')
+                })
+    
+    if critical_params:
+        alerts.append({
+            'type': 'critical',
+            'title': '🚨 Parámetros Críticos',
+            'message': f"{len(critical_params)} parámetro(s) fuera de rango",
+            'details': critical_params,
+            'priority': 'high'
+        })
+    
+    # 2. Alerta por días sin medición
+    days_since = (pd.Timestamp.now().date() - latest_data['Dia'].date()).days
+    if days_since >= 3:
+        alerts.append({
+            'type': 'maintenance',
+            'title': '📅 Medición Pendiente',
+            'message': f"Han pasado {days_since} días desde la última medición",
+            'priority': 'medium' if days_since < 7 else 'high'
+        })
+    
+    # 3. Alertas de tendencias (últimos 3 registros)
+    if len(df) >= 3:
+        recent_data = df.tail(3)
+        
+        # pH tendencia descendente crítica
+        if 'pH' in recent_data.columns:
+            ph_trend = recent_data['pH'].tolist()
+            if all(ph_trend[i] > ph_trend[i+1] for i in range(len(ph_trend)-1)) and ph_trend[-1] < 7.0:
+                alerts.append({
+                    'type': 'trend',
+                    'title': '📉 pH en Descenso',
+                    'message': f"pH bajando consistentemente. Actual: {ph_trend[-1]}",
+                    'priority': 'medium'
+                })
+        
+        # FAC consistentemente bajo
+        if 'FAC' in recent_data.columns:
+            fac_values = recent_data['FAC'].tolist()
+            if all(val < 1.0 for val in fac_values):
+                alerts.append({
+                    'type': 'trend',
+                    'title': '🟡 FAC Persistentemente Bajo',
+                    'message': f"FAC por debajo de 1.0 ppm en últimas 3 mediciones",
+                    'priority': 'medium'
+                })
+    
+    # 4. Mantenimiento vencido (si se proporcionan los datos de mantenimiento ya cargados)
+    if maint_df is not None:
+        try:
+            if not maint_df.empty and 'Proximo_Mantenimiento' in maint_df.columns:
+                
+                # Filtrar mantenimientos vencidos
+                overdue_tasks = []
+                
+                for _, task in maint_df.iterrows():
+                    if pd.notna(task['Proximo_Mantenimiento']) and task['Proximo_Mantenimiento'] <= pd.Timestamp.now():
+                        
+                        # Verificar si ya se hizo mantenimiento del mismo tipo después de la fecha programada
+                        same_type_after = maint_df[
+                            (maint_df['Tipo'] == task['Tipo']) & 
+                            (maint_df['Fecha'] >= task['Proximo_Mantenimiento'])
+                        ]
+                        
+                        # Si no hay mantenimiento del mismo tipo posterior, sigue vencido
+                        if same_type_after.empty:
+                            overdue_tasks.append(task)
+                        else:
+                            pass           
+                if overdue_tasks:
+                    alerts.append({
+                        'type': 'maintenance',
+                        'title': '🔧 Mantenimiento Vencido',
+                        'message': f"{len(overdue_tasks)} tarea(s) de mantenimiento pendiente(s)",
+                        'details': [{'Tipo': t['Tipo'], 'Proximo_Mantenimiento': t['Proximo_Mantenimiento']} for t in overdue_tasks],
+                        'priority': 'high'
+                    })
+        except Exception:
+            pass  # Si hay error con mantenimiento, no mostrar alerta
+            
+    return alerts
+
+# Acción recomendada por parámetro y estado para el análisis sin IA
+RULE_ACTIONS = {
+    ('pH', 'high'): "Añadir reductor de pH (ácido) en pequeñas dosis y volver a medir en 6 horas",
+    ('pH', 'low'): "Añadir incrementador de pH y revisar la alcalinidad",
+    ('Sal', 'low'): "Añadir sal hasta el rango del clorador con la bomba en marcha",
+    ('Sal', 'high'): "Renovar parte del agua para diluir la sal",
+    ('FAC', 'low'): "Subir la producción del clorador o hacer una cloración de choque",
+    ('FAC', 'high'): "Bajar la producción del clorador y no bañarse hasta que baje",
+    ('ORP', 'low'): "Revisar cloro libre y pH: la capacidad de desinfección es baja",
+    ('ORP', 'high'): "Reducir la producción de cloro",
+    ('TDS', 'high'): "Valorar renovar parte del agua (sólidos disueltos altos)",
+    ('Conductividad', 'high'): "Valorar renovar parte del agua (conductividad alta)",
+    ('Conductividad', 'low'): "Comprobar la sal y la calibración del medidor",
+}
+
+def rule_based_analysis(df, maint_df=None):
+    """Análisis determinista a partir de RANGES y analyze_alerts (cuando la IA no está disponible)"""
+    if df.empty:
+        return "📊 No hay datos suficientes para analizar"
+
+    latest_data = df.iloc[-1]
+    estado = []
+    acciones = []
+    for param, rango in RANGES.items():
+        if param not in latest_data or pd.isna(latest_data[param]):
+            continue
+        status = check_parameter_status(latest_data[param], param)
+        texto = get_status_info(status)['text']
+        valor = f"{latest_data[param]} {rango['unit']}" if rango['unit'] else f"{latest_data[param]}"
+        estado.append(f"• {param}: {valor} ({texto}; óptimo {rango['min']}-{rango['max']})")
+        if (param, status) in RULE_ACTIONS:
+            acciones.append(f"• {RULE_ACTIONS[(param, status)]}")
+
+    alertas = []
+    for alert in analyze_alerts(df, maint_df):
+        alertas.append(f"• {alert['title']}: {alert['message']}")
+        if alert['title'] == '🔧 Mantenimiento Vencido':
+            acciones.extend(f"• Realizar el mantenimiento pendiente: {t['Tipo']}" for t in alert.get('details', []))
+
+    lineas = ["🎯 **ESTADO ACTUAL**"] + estado
+    lineas += ["", "⚠️ **ALERTAS**"] + (alertas or ["• Sin alertas"])
+    lineas += ["", "💡 **RECOMENDACIONES**"] + (acciones[:4] or ["• Mantener la rutina actual de mediciones"])
+    return "\n".join(lineas)
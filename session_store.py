@@ -0,0 +1,71 @@
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import streamlit as st
+
+# Sesiones de usuario en disco: token opaco -> usuario y hoja de cálculo
+SESSION_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "sessions.sqlite3")
+
+
+class SessionStore:
+    """Almacén de sesiones (SQLite) con búsqueda por token en O(1) y caducidad"""
+
+    def __init__(self, path=SESSION_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                token TEXT PRIMARY KEY,
+                email TEXT,
+                spreadsheet_id TEXT,
+                picture TEXT,
+                created_at REAL,
+                expires REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires)")
+
+    def create(self, email, spreadsheet_id, picture, expires):
+        """Registra una sesión nueva y devuelve su token"""
+        token = secrets.token_urlsafe(32)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO sessions (token, email, spreadsheet_id, picture, created_at, expires) VALUES (?, ?, ?, ?, ?, ?)",
+                (token, email, spreadsheet_id, picture, now, expires)
+            )
+            self.conn.execute("DELETE FROM sessions WHERE expires < ?", (now,))
+        return token
+
+    def get(self, token):
+        """Devuelve {'email', 'spreadsheet_id', 'picture', 'expires'} o None si no existe o ha caducado"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT email, spreadsheet_id, picture, expires FROM sessions WHERE token = ?", (token,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() > row[3]:
+                self.conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+                return None
+        return {'email': row[0], 'spreadsheet_id': row[1], 'picture': row[2], 'expires': row[3]}
+
+    def extend(self, token, expires):
+        """Actualiza la caducidad de una sesión"""
+        with self.lock:
+            self.conn.execute("UPDATE sessions SET expires = ? WHERE token = ?", (expires, token))
+
+    def delete(self, token):
+        """Elimina una sesión (logout)"""
+        with self.lock:
+            self.conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+
+@st.cache_resource
+def get_session_store():
+    """Instancia única del almacén de sesiones para todo el proceso"""
+    return SessionStore()
@@ -0,0 +1,145 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import streamlit as st
+from sheets_data import (MAINTENANCE_COLUMNS, MEASUREMENT_COLUMNS, clear_maintenance_reminder,
+                         get_data_from_sheets, get_maintenance_data, maintenance_frame, measurements_frame)
+
+# Escrituras en Google Sheets simultáneas por proceso
+SHEETS_MAX_CONCURRENT_WRITES = 4
+# Antigüedad máxima de la copia local antes de volver a leer la hoja (segundos)
+SHEETS_CACHE_TTL_SECONDS = 30
+
+
+def append_row_locally(df, row, columns, to_frame):
+    """Añade una fila (valores como se escriben en la hoja) al DataFrame, con los mismos tipos"""
+    columnas = list(df.columns) if not df.empty else columns
+    nueva = to_frame([dict(zip(columnas, row))])
+    return nueva if df.empty else pd.concat([df, nueva], ignore_index=True)
+
+def clear_reminder_locally(df, tipo_mantenimiento, fecha_programada):
+    """Quita el recordatorio de la primera fila con ese tipo y fecha (como clear_maintenance_reminder)"""
+    if df.empty or 'Proximo_Mantenimiento' not in df.columns:
+        return df
+    fecha = pd.Timestamp(fecha_programada).normalize()
+    coincide = (df['Tipo'] == tipo_mantenimiento) & (df['Proximo_Mantenimiento'].dt.normalize() == fecha)
+    if not coincide.any():
+        return df
+    df = df.copy()
+    df.loc[coincide.idxmax(), 'Proximo_Mantenimiento'] = pd.NaT
+    return df
+
+
+class PendingWrite:
+    """Cambio ya aplicado en la copia local y enviado a Google Sheets, pendiente de respuesta"""
+
+    def __init__(self, hoja, apply, future, descripcion):
+        self.hoja = hoja
+        self.apply = apply  # DataFrame -> DataFrame con el cambio aplicado
+        self.future = future
+        self.descripcion = descripcion
+
+
+class SheetState:
+    """
+    Copia local de las hojas de mediciones y mantenimiento de un usuario, con escrituras optimistas.
+
+    base guarda lo último confirmado por Google Sheets y pending los cambios enviados sin
+    respuesta; lo que ve la app es base con los cambios pendientes aplicados. Al confirmarse,
+    el cambio pasa a base; si falla, se descarta (la vista vuelve a base) y queda en errors.
+    Mientras una hoja tiene escrituras pendientes no se vuelve a leer, para no contar dos veces
+    una fila que Sheets ya tenga.
+    """
+
+    def __init__(self, spreadsheet_id):
+        self.spreadsheet_id = spreadsheet_id
+        self.base = {}
+        self.loaded_at = {}
+        self.pending = []
+        self.errors = []
+
+    def _frame(self, hoja, loader):
+        self.reconcile()
+        pendientes = [w for w in self.pending if w.hoja == hoja]
+        caducada = time.time() - self.loaded_at.get(hoja, 0) > SHEETS_CACHE_TTL_SECONDS
+        if hoja not in self.base or (caducada and not pendientes):
+            self.base[hoja] = loader()
+            self.loaded_at[hoja] = time.time()
+
+        df = self.base[hoja]
+        for write in pendientes:
+            df = write.apply(df)
+        return df
+
+    def measurements(self, main_sheet):
+        """Mediciones (copia local, releída cada SHEETS_CACHE_TTL_SECONDS)"""
+        return self._frame("mediciones", lambda: get_data_from_sheets(main_sheet))
+
+    def maintenance(self, maintenance_sheet):
+        """Registros de mantenimiento (copia local, releída cada SHEETS_CACHE_TTL_SECONDS)"""
+        return self._frame("mantenimiento", lambda: get_maintenance_data(maintenance_sheet))
+
+    def _submit(self, hoja, apply, write, descripcion):
+        """Aplica el cambio en local y lanza la escritura en segundo plano"""
+        apply(self.base[hoja])  # si el cambio no se puede aplicar en local, no se envía
+        self.pending.append(PendingWrite(hoja, apply, get_sheets_writer().submit(write), descripcion))
+
+    def append_measurement(self, main_sheet, row):
+        self.measurements(main_sheet)  # el cambio optimista se aplica sobre la copia local
+        self._submit(
+            "mediciones",
+            lambda df: append_row_locally(df, row, MEASUREMENT_COLUMNS, measurements_frame),
+            lambda: main_sheet.append_row(row),
+            f"Medición del {row[0]} {row[1]}"
+        )
+
+    def append_maintenance(self, maintenance_sheet, row):
+        self.maintenance(maintenance_sheet)
+        self._submit(
+            "mantenimiento",
+            lambda df: append_row_locally(df, row, MAINTENANCE_COLUMNS, maintenance_frame),
+            lambda: maintenance_sheet.append_row(row),
+            f"Mantenimiento '{row[1]}' del {row[0]}"
+        )
+
+    def clear_reminder(self, maintenance_sheet, tipo_mantenimiento, fecha_programada):
+        self.maintenance(maintenance_sheet)
+        self._submit(
+            "mantenimiento",
+            lambda df: clear_reminder_locally(df, tipo_mantenimiento, fecha_programada),
+            lambda: clear_maintenance_reminder(maintenance_sheet, tipo_mantenimiento, fecha_programada),
+            f"Borrado del recordatorio '{tipo_mantenimiento}'"
+        )
+
+    def reconcile(self):
+        """Pasa a base las escrituras confirmadas y descarta (rollback) las que fallaron"""
+        pendientes = []
+        for write in self.pending:
+            if not write.future.done():
+                pendientes.append(write)
+                continue
+            error = write.future.exception()
+            if error is None and write.future.result() is not False:
+                self.base[write.hoja] = write.apply(self.base[write.hoja])
+            else:
+                self.errors.append(f"{write.descripcion}: {error or 'no se encontró en la hoja'}")
+        self.pending = pendientes
+
+    def pop_errors(self):
+        """Errores de escritura aún no mostrados al usuario"""
+        errors, self.errors = self.errors, []
+        return errors
+
+
+@st.cache_resource
+def get_sheets_writer():
+    """Pool de escrituras en Google Sheets compartido por todas las sesiones del proceso"""
+    return ThreadPoolExecutor(max_workers=SHEETS_MAX_CONCURRENT_WRITES, thread_name_prefix="sheets-write")
+
+def get_sheet_state(spreadsheet_id):
+    """Copia local de las hojas del usuario de esta sesión (se descarta si cambia la hoja de cálculo)"""
+    state = st.session_state.get("sheet_state")
+    if state is None or state.spreadsheet_id != spreadsheet_id:
+        state = SheetState(spreadsheet_id)
+        st.session_state["sheet_state"] = state
+    return state
@@ -0,0 +1,99 @@
+import pandas as pd
+import streamlit as st
+
+
+# Columnas de las hojas, en el orden en que se escriben las filas
+MEASUREMENT_COLUMNS = ['Dia', 'Hora', 'pH', 'Conductividad', 'TDS', 'Sal', 'ORP', 'FAC', 'Temperatura', 'Notas']
+MAINTENANCE_COLUMNS = ['Fecha', 'Tipo', 'Estado_Antes', 'Tiempo_Minutos', 'Notas', 'Proximo_Mantenimiento']
+
+
+def measurements_frame(records):
+    """DataFrame de mediciones con tipos (fecha, hora y números) a partir de filas de la hoja"""
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame(records)
+    
+    # Convertir fecha y hora
+    df['Dia'] = pd.to_datetime(df['Dia'])
+    df['Hora'] = pd.to_datetime(df['Hora'], format='%H:%M').dt.time
+    
+    # Convertir columnas numéricas, reemplazando comas por puntos
+    numeric_columns = ['pH', 'Conductividad', 'TDS', 'Sal', 'ORP', 'FAC','Temperatura']
+    for col in numeric_columns:
+        if col in df.columns:
+            # Convertir a string, reemplazar coma por punto, luego a float
+            df[col] = df[col].astype(str).str.replace(',', '.').astype(float)
+    
+    return df
+
+def maintenance_frame(records):
+    """DataFrame de mantenimiento con las fechas convertidas a partir de filas de la hoja"""
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame(records)
+    df['Fecha'] = pd.to_datetime(df['Fecha'])
+    if 'Proximo_Mantenimiento' in df.columns and len(df) > 0:
+        df['Proximo_Mantenimiento'] = pd.to_datetime(df['Proximo_Mantenimiento'], errors='coerce')
+    return df
+
+def get_data_from_sheets(main_sheet):
+    """Obtiene los datos de Google Sheets"""
+    try:
+        return measurements_frame(main_sheet.get_all_records())
+    except Exception as e:
+        st.error(f"Error obteniendo datos: {e}")
+        return pd.DataFrame()
+
+def get_data_version(df):
+    """Huella de los datos cargados: cambia si se añade, borra o edita cualquier fila"""
+    if df.empty:
+        return "empty"
+    return f"{len(df)}-{pd.util.hash_pandas_object(df, index=False).sum():x}"
+
+def get_maintenance_data(maintenance_sheet):
+    """Obtiene los datos de mantenimiento de Google Sheets"""
+    try:
+        return maintenance_frame(maintenance_sheet.get_all_records())
+    except Exception as e:
+        st.error(f"Error obteniendo datos de mantenimiento: {e}")
+        return pd.DataFrame()
+
+def get_pool_info(info_sheet):
+    """Obtiene la información de la piscina desde Google Sheets"""
+    try:
+        if info_sheet is None:
+            return {}
+            
+        data = info_sheet.get_all_records()
+        if data:
+            # Convertir lista de diccionarios a diccionario simple
+            pool_info = {}
+            for row in data:
+                if row.get('Campo') and row.get('Campo') != '':
+                    pool_info[row['Campo']] = {
+                        'valor': row.get('Valor', ''),
+                        'notas': row.get('Notas', '')
+                    }
+            return pool_info
+        else:
+            return {}
+    except Exception as e:
+        st.error(f"Error obteniendo información de piscina: {e}")
+        return {}
+
+def clear_maintenance_reminder(maintenance_sheet, tipo_mantenimiento, fecha_programada):
+    """
+    Borra el recordatorio (columna Proximo_Mantenimiento) de la primera fila con ese tipo y fecha.
+
+    Devuelve False si no existe; los errores de la API se propagan para poder llamarla
+    desde un hilo en segundo plano.
+    """
+    all_data = maintenance_sheet.get_all_values()
+    fecha_buscar = fecha_programada.strftime('%Y-%m-%d')
+    
+    # Columna 1 = Tipo (índice 1), Columna 5 = Proximo_Mantenimiento (índice 5); la fila 0 es el header
+    for row_num, row_data in enumerate(all_data[1:], start=2):
+        if len(row_data) >= 6 and row_data[1] == tipo_mantenimiento and row_data[5] == fecha_buscar:
+            maintenance_sheet.update_cell(row_num, 6, "")
+            return True
+    return False
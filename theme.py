@@ -0,0 +1,42 @@
+import hashlib
+import os
+import streamlit as st
+
+# Hoja de estilos de la app. Por defecto se incrusta en un <style>. Si server.enableStaticServing
+# está activo (.streamlit/config.toml) y Streamlit sirve static/ con su tipo MIME (servidor
+# Starlette, desde 1.57; el de Tornado anterior entrega el CSS como text/plain con nosniff y el
+# navegador lo ignora), se enlaza en app/static/ para que el navegador la descargue una vez y la
+# cachee. La URL es relativa para que funcione también con server.baseUrlPath.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+THEME_CSS_FILE = "pool_master.css"
+STATIC_CSS_MIN_STREAMLIT = (1, 57)
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+THEME_CSS_FILE = "pool_master.css"
+
+
+@st.cache_resource
+def _theme_css():
+    """Contenido de la hoja de estilos y su huella (cambia la URL solo cuando cambia el CSS)"""
+    with open(os.path.join(STATIC_DIR, THEME_CSS_FILE), encoding="utf-8") as f:
+        css = f.read()
+    return css, hashlib.sha1(css.encode("utf-8")).hexdigest()[:10]
+
+def _static_css_served():
+    """True si la hoja de estilos se puede enlazar desde app/static/ con su tipo MIME correcto"""
+    if not st.get_option("server.enableStaticServing"):
+        return False
+    try:
+        version = tuple(int(parte) for parte in st.__version__.split(".")[:2])
+    except ValueError:
+        return False
+    return version >= STATIC_CSS_MIN_STREAMLIT
+
+def inject_theme_css():
+    """Incrusta la hoja de estilos; si Streamlit la sirve como CSS estático, la enlaza"""
+    css, version = _theme_css()
+    if _static_css_served():
+        st.markdown(f'<link rel="stylesheet" href="app/static/{THEME_CSS_FILE}?v={version}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
@@ -1,7 +1,46 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import streamlit as st
 
+# Archivo maestro 'usuarios_control_piscinas'
+MASTER_SPREADSHEET_ID = "1jzuCIUZ44MGJOSQoHWDXU0KBZIVsB5tKY4xEG-AAPUg"
+
+def get_service_client():
+    """Cliente de gspread autenticado con la cuenta de servicio"""
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    scope = [
+        "https://spreadsheets.google.com/feeds",
+        "https://www.googleapis.com/auth/drive"
+    ]
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(
+        st.secrets["gcp_service_account"], scope
+    )
+    return gspread.authorize(creds)
+
+def _get_user_records(client=None):
+    """Filas de la hoja 'usuarios' del archivo maestro"""
+    client = client or get_service_client()
+    sheet = client.open_by_key(MASTER_SPREADSHEET_ID)
+    worksheet = sheet.worksheet("usuarios")  # Asegúrate de que se llama así
+    return worksheet.get_all_records()
+
+def _is_active(row):
+    return str(row.get("activo", "")).strip().lower() in ["sí", "si", "true", "1"]
+
+def get_active_users(client=None):
+    """
+    Lista (email, spreadsheet_id) de todos los usuarios activos del archivo maestro.
+
+    La usan los procesos sin interfaz (p. ej. batch_ai.py).
+    """
+    users = []
+    for row in _get_user_records(client):
+        email = str(row.get("email", "")).strip().lower()
+        spreadsheet_id = str(row.get("spreadsheet_id", "")).strip()
+        if email and spreadsheet_id and _is_active(row):
+            users.append((email, spreadsheet_id))
+    return users
+
 def get_user_spreadsheet_id(user_email: str) -> str:
     """
     Busca el spreadsheet_id del usuario autenticado en la hoja 'usuarios' 
@@ -16,31 +55,15 @@ def get_user_spreadsheet_id(user_email: str) -> str:
     Raises:
         ValueError: Si el email no está autorizado o no está activo.
     """
-    # Autenticación con cuenta de servicio
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive"
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(
-        st.secrets["gcp_service_account"], scope
-    )
-    client = gspread.authorize(creds)
-
-    # Abrir el archivo maestro de usuarios
-    MASTER_SPREADSHEET_ID = "1jzuCIUZ44MGJOSQoHWDXU0KBZIVsB5tKY4xEG-AAPUg"
-    sheet = client.open_by_key(MASTER_SPREADSHEET_ID)
-    worksheet = sheet.worksheet("usuarios")  # Asegúrate de que se llama así
-
-    # Leer todos los registros
-    records = worksheet.get_all_records()
+    # Leer todos los registros (autenticación con cuenta de servicio)
+    records = _get_user_records()
 
     for row in records:
         email = row.get("email", "").strip().lower()
         spreadsheet_id = row.get("spreadsheet_id", "").strip()
-        activo = row.get("activo", "").strip().lower()
 
         if user_email.strip().lower() == email:
-            if activo in ["sí", "si", "true", "1"]:
+            if _is_active(row):
                 return spreadsheet_id
             else:
                 raise ValueError(f"El usuario '{user_email}' no está activo.")